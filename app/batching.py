@@ -0,0 +1,94 @@
+import asyncio
+import time
+
+from prometheus_client import Histogram
+
+# Exposed on /metrics next to the instrumentator's request metrics
+BATCH_SIZE = Histogram(
+    "predict_micro_batch_size",
+    "Number of /predict requests coalesced into one model evaluation.",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256)
+)
+QUEUE_WAIT = Histogram(
+    "predict_queue_wait_seconds",
+    "Time a /predict request waited in the micro-batch queue.",
+    buckets=(0.0005, 0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1)
+)
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-record requests into one vectorized call.
+    A batch is flushed when it reaches max_batch_size or when the oldest
+    request has waited max_wait_ms, whichever comes first.
+    """
+
+    def __init__(self, predict_fn, max_batch_size: int = 64, max_wait_ms: float = 2.0):
+        # predict_fn takes a list of records and returns one result per record
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = None
+        self._worker = None
+        self._loop = None
+
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def submit(self, record):
+        """Queues one record and waits for its result."""
+        self._ensure_started()
+        future = self._loop.create_future()
+        await self._queue.put((record, future, time.perf_counter()))
+        return await future
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def _collect(self):
+        """Waits for the first request, then gathers more until size or deadline."""
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+
+            dispatched_at = time.perf_counter()
+            BATCH_SIZE.observe(len(batch))
+            for _, _, enqueued_at in batch:
+                QUEUE_WAIT.observe(dispatched_at - enqueued_at)
+
+            records = [record for record, _, _ in batch]
+            try:
+                # Run the model off the event loop so new requests keep queueing
+                results = await self._loop.run_in_executor(None, self.predict_fn, records)
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future, _), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
@@ -0,0 +1,222 @@
+import json
+import logging
+import math
+import threading
+from pathlib import Path
+
+import numpy as np
+from prometheus_client import Gauge
+
+FEATURE_PSI = Gauge(
+    "feature_drift_psi",
+    "Population stability index of the recent request window against the training profile.",
+    ["feature"]
+)
+FEATURE_KS = Gauge(
+    "feature_drift_ks",
+    "Largest gap between the binned window and reference CDFs (approximate KS statistic).",
+    ["feature"]
+)
+FEATURE_MEAN_SHIFT = Gauge(
+    "feature_drift_mean_shift",
+    "Window mean minus reference mean, in reference standard deviations.",
+    ["feature"]
+)
+DRIFT_WINDOW = Gauge(
+    "drift_window_samples",
+    "Requests in the drift monitor's rolling window."
+)
+
+# Probability floor so empty bins do not make the PSI infinite
+EPSILON = 1e-4
+
+
+class _FeatureReference:
+    """Reference bins of one feature."""
+
+    def __init__(self, name, ref_probs, edges=None, categories=None, mean=0.0, std=1.0):
+        self.name = name
+        # Numeric features: bin edges. Categorical: sorted category values (last bin = unseen)
+        self.edges = edges
+        self.categories = categories
+        self.ref_probs = ref_probs
+        self.mean, self.std = mean, std
+
+
+class DriftMonitor:
+    """
+    Compares incoming requests with the training data profile written by
+    EDAAutomator.save_stats. Only binned counts and sums are kept, in a
+    ring of n_slices slices covering the last window_size requests, so
+    memory is constant and no raw request is stored. Scores are recomputed
+    and exported as Prometheus gauges whenever a slice fills up.
+    """
+
+    def __init__(self, profile, features, window_size=1000, n_slices=10, n_bins=10):
+        self.slice_size = max(1, window_size // n_slices)
+        self.n_slices = n_slices
+        self.current = 0
+        self._slice_records = 0
+        self.lock = threading.Lock()
+        self.features = []
+        self.scores = {}
+
+        state, frequencies = profile.get("_state", {}), profile.get("_frequencies", {})
+        alpha = next(iter(state.values()))["sketch"]["alpha"] if state else 0.01
+        self._gamma = (1 + alpha) / (1 - alpha)
+        self._log_gamma = math.log(self._gamma)
+
+        for name in features:
+            if name in frequencies:
+                self.features.append(self._categorical_reference(name, frequencies[name], profile[name]))
+            elif name in state:
+                self.features.append(self._numeric_reference(name, state[name], profile[name], n_bins))
+        self.names = [feature.name for feature in self.features]
+
+        # All features' bins side by side, one row per slice of the window
+        sizes = [len(feature.ref_probs) for feature in self.features]
+        self.offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int64) if sizes else np.zeros(0, np.int64)
+        self.counts = np.zeros((n_slices, sum(sizes)), dtype=np.int64)
+        self.sums = np.zeros((n_slices, len(self.features)))
+        self.n = np.zeros((n_slices, len(self.features)), dtype=np.int64)
+
+        # Padded per-feature lookup tables so a batch is binned with a few 2D operations
+        numeric = [j for j, feature in enumerate(self.features) if feature.categories is None]
+        categorical = [j for j, feature in enumerate(self.features) if feature.categories is not None]
+        self._num_idx, self._cat_idx = np.array(numeric, dtype=np.int64), np.array(categorical, dtype=np.int64)
+        self._num_edges = self._pad([self.features[j].edges for j in numeric], np.inf)
+        self._cat_values = self._pad([self.features[j].categories for j in categorical], np.nan)
+        self._cat_unseen = np.array([len(self.features[j].categories) for j in categorical], dtype=np.int64)
+
+    @staticmethod
+    def _pad(arrays, fill):
+        width = max([len(a) for a in arrays] + [1])
+        padded = np.full((len(arrays), width), fill)
+        for row, a in enumerate(arrays):
+            padded[row, :len(a)] = a
+        return padded
+
+    @classmethod
+    def from_profile(cls, path, features, window_size=1000):
+        with open(path) as f:
+            profile = json.load(f)
+        # Sketch state and frequencies are saved next to the stats (DataProfiler.save)
+        with open(Path(path).with_suffix(".state.json")) as f:
+            profile.update(json.load(f))
+        return cls(profile, features, window_size)
+
+    # Reference distributions -------------------------------------------------
+
+    def _numeric_reference(self, name, state, stats, n_bins):
+        # Bucket representatives and counts of the profile's quantile sketch
+        sketch = state["sketch"]
+        entries = [(0.0, sketch["zero_count"])]
+        entries += [(self._bucket_value(int(i)), n) for i, n in sketch["positive"].items()]
+        entries += [(-self._bucket_value(int(i)), n) for i, n in sketch["negative"].items()]
+        entries = sorted(e for e in entries if e[1] > 0)
+        values = np.array([v for v, _ in entries])
+        counts = np.array([n for _, n in entries], dtype=np.float64)
+
+        # Equal-mass bins at the reference deciles
+        cdf = np.cumsum(counts) / counts.sum()
+        cut_points = np.searchsorted(cdf, np.arange(1, n_bins) / n_bins)
+        edges = np.unique(values[np.minimum(cut_points, len(values) - 1)])
+        edges = edges[edges < values[-1]]
+
+        ref_counts = np.bincount(np.searchsorted(edges, values), weights=counts, minlength=len(edges) + 1)
+        return _FeatureReference(name, ref_counts / ref_counts.sum(), edges=edges, mean=stats["mean"], std=stats["std"] or 1.0)
+
+    def _categorical_reference(self, name, table, stats):
+        categories = sorted(table, key=float)
+        ref_counts = np.array([table[key] for key in categories] + [0], dtype=np.float64)
+        return _FeatureReference(
+            name, ref_counts / ref_counts.sum(), categories=np.array([float(key) for key in categories]),
+            mean=stats["mean"], std=stats["std"] or 1.0
+        )
+
+    def _bucket_value(self, index):
+        return 2 * self._gamma ** index / (self._gamma + 1)
+
+    def _snap(self, values):
+        """Maps values onto sketch bucket representatives so they bin exactly like the reference."""
+        magnitude = np.abs(values)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            index = np.ceil(np.log(magnitude) / self._log_gamma)
+        return np.where(magnitude == 0, 0.0, np.sign(values) * 2 * self._gamma ** index / (self._gamma + 1))
+
+    # Online updates ----------------------------------------------------------
+
+    def observe(self, records):
+        """Adds a batch of request records (dicts of field -> value, None when missing)."""
+        values = np.array([[record.get(name) for name in self.names] for record in records], dtype=np.float64)
+        values = values.reshape(len(records), len(self.names))
+        present = ~np.isnan(values)
+
+        # Bin index per value: edges below it (numeric) or category position, last bin if unseen
+        bins = np.zeros(values.shape, dtype=np.int64)
+        if len(self._num_idx):
+            snapped = self._snap(values[:, self._num_idx])
+            bins[:, self._num_idx] = (snapped[:, :, np.newaxis] > self._num_edges).sum(axis=2)
+        if len(self._cat_idx):
+            match = values[:, self._cat_idx, np.newaxis] == self._cat_values
+            bins[:, self._cat_idx] = np.where(match.any(axis=2), match.argmax(axis=2), self._cat_unseen)
+        flat_bins = bins + self.offsets
+
+        with self.lock:
+            # Split the batch at slice boundaries so a large batch rotates through
+            # the ring instead of overfilling one slice; the window stays bounded
+            start = 0
+            while start < len(records):
+                stop = min(len(records), start + self.slice_size - self._slice_records)
+                rows = present[start:stop]
+                self.counts[self.current] += np.bincount(flat_bins[start:stop][rows], minlength=self.counts.shape[1])
+                self.sums[self.current] += np.where(rows, values[start:stop], 0.0).sum(axis=0)
+                self.n[self.current] += rows.sum(axis=0)
+
+                self._slice_records += stop - start
+                start = stop
+                if self._slice_records >= self.slice_size:
+                    # Scores only for the last slice this batch fills; earlier ones would be overwritten
+                    if len(records) - stop < self.slice_size:
+                        self._update_scores()
+                    self._rotate()
+
+    def _rotate(self):
+        self.current = (self.current + 1) % self.n_slices
+        self._slice_records = 0
+        self.counts[self.current] = 0
+        self.sums[self.current] = 0.0
+        self.n[self.current] = 0
+
+    def _update_scores(self):
+        scores = {}
+        window_counts, window_sums, window_n = self.counts.sum(axis=0), self.sums.sum(axis=0), self.n.sum(axis=0)
+        for j, feature in enumerate(self.features):
+            n = window_n[j]
+            if n == 0:
+                continue
+            counts = window_counts[self.offsets[j]:self.offsets[j] + len(feature.ref_probs)]
+            live = np.maximum(counts / n, EPSILON)
+            ref = np.maximum(feature.ref_probs, EPSILON)
+
+            psi = float(np.sum((live - ref) * np.log(live / ref)))
+            mean_shift = float((window_sums[j] / n - feature.mean) / feature.std)
+            FEATURE_PSI.labels(feature=feature.name).set(psi)
+            FEATURE_MEAN_SHIFT.labels(feature=feature.name).set(mean_shift)
+            scores[feature.name] = {"psi": psi, "mean_shift": mean_shift, "samples": int(n)}
+
+            # A CDF only makes sense for ordered (numeric) bins
+            if feature.categories is None:
+                ks = float(np.max(np.abs(np.cumsum(counts) / n - np.cumsum(feature.ref_probs))))
+                FEATURE_KS.labels(feature=feature.name).set(ks)
+                scores[feature.name]["ks"] = ks
+
+        DRIFT_WINDOW.set(max((s["samples"] for s in scores.values()), default=0))
+        self.scores = scores
+        logging.info(f"Drift scores (PSI): { {name: round(s['psi'], 4) for name, s in scores.items()} }")
+
+    def snapshot(self):
+        """Recomputes and returns the current per-feature drift scores."""
+        with self.lock:
+            self._update_scores()
+            return self.scores
@@ -0,0 +1,67 @@
+import time
+
+from prometheus_client import Histogram
+
+STAGE_LATENCY = Histogram(
+    "predict_stage_duration_seconds",
+    "Time spent in one inference stage per scoring call (a call may cover a whole batch).",
+    ["stage", "model", "version"],
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+)
+
+# Labelled children are looked up once; labels() is several times slower than observe()
+_children = {}
+
+
+def observe_stage(stage, bundle, seconds):
+    key = (stage, bundle.name, bundle.version)
+    child = _children.get(key)
+    if child is None:
+        child = _children[key] = STAGE_LATENCY.labels(stage=stage, model=bundle.name, version=bundle.version or "unknown")
+    child.observe(seconds)
+
+
+def drop_previous_versions(bundle):
+    """
+    Registry subscriber: removes the series of every model version but the
+    new one, so hot reloads do not grow the label set (and _children)
+    without bound. A request still finishing on the old bundle may re-add
+    its series; the next swap removes it again.
+    """
+    for key in list(_children):
+        stage, name, version = key
+        if version == bundle.version:
+            continue
+        _children.pop(key, None)
+        try:
+            STAGE_LATENCY.remove(stage, name, version or "unknown")
+        except KeyError:
+            pass
+
+
+class StageTimer:
+    """Times the stages of one scoring call against the bundle that serves it."""
+
+    def __init__(self, bundle):
+        self.bundle = bundle
+        self.timings = {}
+
+    def stage(self, name):
+        return _Stage(self, name)
+
+
+class _Stage:
+    # A plain context manager: a generator-based one costs more than the observation itself
+    __slots__ = ("timer", "name", "start")
+
+    def __init__(self, timer, name):
+        self.timer, self.name = timer, name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        seconds = time.perf_counter() - self.start
+        timings = self.timer.timings
+        timings[self.name] = timings.get(self.name, 0.0) + seconds
+        observe_stage(self.name, self.timer.bundle, seconds)
@@ -1,7 +1,18 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-import joblib
-import pandas as pd
+import time
+
+# Cold-start clock: started before the framework and app modules are imported
+IMPORT_STARTED = time.perf_counter()
+
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, Header, HTTPException, Response
+from fastapi.responses import PlainTextResponse
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, ConfigDict, ValidationError, model_validator
+from typing import Any, Dict, List, Optional
+import os
+import json
+import threading
 import numpy as np
 from pathlib import Path
 
@@ -9,77 +20,462 @@ import logging
 from datetime import datetime
 from prometheus_fastapi_instrumentator import Instrumentator
 
+from src.compiled_preprocessor import CompiledPreprocessor
+from src.array_model import ArrayModel
+from app.memory import memory_report
+from app.registry import ModelBundle, ModelRegistry
+from app.batching import MicroBatcher
+from app.drift import DriftMonitor
+from src.async_logging import enable_queue_logging, RequestLogSampler
+from app.prediction_cache import PredictionCache
+from app.instrumentation import StageTimer, drop_previous_versions, observe_stage
+from app.profiler import SamplingProfiler
+from app.startup import StartupState
+
+# Write api_activity.log from a background thread so requests only enqueue their log records
+API_LOG_ASYNC = os.getenv("API_LOG_ASYNC", "1") == "1"
+# Fraction of per-request log lines that are written (errors are always logged)
+REQUEST_LOG_SAMPLE_RATE = float(os.getenv("REQUEST_LOG_SAMPLE_RATE", "1"))
+
 # Setup logging configuration
-logging.basicConfig(
-    filename='api_activity.log',
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+activity_handler = logging.FileHandler('api_activity.log')
+activity_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+logging.getLogger().setLevel(logging.INFO)
+if API_LOG_ASYNC:
+    enable_queue_logging(logging.getLogger(), [activity_handler])
+else:
+    logging.getLogger().addHandler(activity_handler)
+sample_request_log = RequestLogSampler(REQUEST_LOG_SAMPLE_RATE)
+
+startup = StartupState()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Starts loading and warming up the model in the background, so /healthz
+    answers at once while /readyz (and prediction endpoints) return 503
+    until the worker is warm.
+    """
+    # Module import up to the server starting the app
+    startup.record("import", time.perf_counter() - IMPORT_STARTED)
+    app.state.startup_task = asyncio.create_task(asyncio.to_thread(start_worker))
+    yield
+    if micro_batcher is not None:
+        await micro_batcher.stop()
+    registry.stop_watching()
 
 # Initialize FastAPI
-app = FastAPI(title="Heart Disease Prediction API")
+app = FastAPI(title="Heart Disease Prediction API", lifespan=lifespan)
 
-# start tracking metrics
-instrumentator = Instrumentator()
+# start tracking metrics; probe traffic is left out of the request metrics
+instrumentator = Instrumentator(excluded_handlers=["/healthz", "/readyz"])
 instrumentator.instrument(app).expose(app)
 
-@app.on_event("startup")
-async def expose_metrics():
-    instrumentator.expose(app)
-
 # Path to artifacts
 MODEL_PATH = Path("models/best_model.pkl")
 PREPROCESSOR_PATH = Path("models/preprocessor.pkl")
+# Fill values fitted by DataIngestion; lets /predict score records with missing fields
+IMPUTER_PATH = Path("models/imputer.json")
+MODEL_ARRAY_PATH = Path("models/best_model.npz")
+MODEL_MMAP_DIR = Path("models/best_model_mmap")
+
+# "pickle" loads the sklearn artifacts; "npz" serves the array export with NumPy only;
+# "mmap" memory-maps the array export so all workers share one copy via the page cache
+MODEL_FORMAT = os.getenv("MODEL_FORMAT", "pickle")
+
+# Use the pandas-free preprocessing path when it reproduces the pickle exactly
+USE_COMPILED_PREPROCESSOR = os.getenv("USE_COMPILED_PREPROCESSOR", "1") == "1"
+
+# Probability of the positive class above which a patient is labelled Positive.
+# Lower it to favour recall, the metric ModelEvaluator selects models on.
+DECISION_THRESHOLD = float(os.getenv("DECISION_THRESHOLD", "0.5"))
+
+# Upper bound on the number of patients accepted by /predict/batch
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "1000"))
+
+# Coalesce concurrent /predict calls into one model evaluation
+MICRO_BATCH_ENABLED = os.getenv("MICRO_BATCH_ENABLED", "0") == "1"
+MICRO_BATCH_MAX_SIZE = int(os.getenv("MICRO_BATCH_MAX_SIZE", "64"))
+MICRO_BATCH_MAX_WAIT_MS = float(os.getenv("MICRO_BATCH_MAX_WAIT_MS", "2"))
+
+# Poll the artifacts every N seconds and hot-swap a changed model (0 disables the watcher)
+MODEL_WATCH_INTERVAL_S = float(os.getenv("MODEL_WATCH_INTERVAL_S", "0"))
+
+# Training data profile (EDAAutomator.save_stats) that incoming requests are compared against
+DRIFT_PROFILE_PATH = Path(os.getenv("DRIFT_PROFILE_PATH", "reports/data_profile.json"))
+DRIFT_ENABLED = os.getenv("DRIFT_ENABLED", "1") == "1"
+# Number of most recent requests the drift scores are computed over
+DRIFT_WINDOW_SIZE = int(os.getenv("DRIFT_WINDOW_SIZE", "1000"))
+
+# Probabilities of recently scored payloads, reused for identical re-submissions (0 disables)
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "10000"))
+PREDICTION_CACHE_TTL_S = float(os.getenv("PREDICTION_CACHE_TTL_S", "300"))
+
+# Sampling profiler: per request with the "X-Profile: 1" header, or for all threads via /admin/profile
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "0") == "1"
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", "reports/profiles"))
+PROFILE_INTERVAL_S = float(os.getenv("PROFILE_INTERVAL_MS", "1")) / 1000
+
+# Synthetic records run through validation, preprocessing and the model before the worker reports ready (0 skips)
+WARMUP_BATCH_SIZE = int(os.getenv("WARMUP_BATCH_SIZE", "32"))
+# Warm-up input when the model has no compiled preprocessor to derive probe records from
+WARMUP_PATIENT = {
+    "age": 63, "sex": 1, "cp": 1, "trestbps": 145, "chol": 233, "fbs": 1, "restecg": 2,
+    "thalach": 150, "exang": 0, "oldpeak": 2.3, "slope": 3, "ca": 0, "thal": 6
+}
+
+def load_bundle() -> ModelBundle:
+    """Loads the model and preprocessor in the configured MODEL_FORMAT."""
+    if MODEL_FORMAT == "npz":
+        if not MODEL_ARRAY_PATH.exists():
+            raise RuntimeError("Array model export not found. Run the DVC pipeline first.")
+
+        model = ArrayModel.load(MODEL_ARRAY_PATH)
+        logging.info(f"Loaded array model export ({model.kind}) from {MODEL_ARRAY_PATH}")
+        return ModelBundle(model, compiled_preprocessor=model.preprocessor)
 
-# Load model and preprocessor once at startup
-if not MODEL_PATH.exists() or not PREPROCESSOR_PATH.exists():
-    raise RuntimeError("Model or Preprocessor file not found. Run the DVC pipeline first.")
+    if MODEL_FORMAT == "mmap":
+        if not MODEL_MMAP_DIR.exists():
+            raise RuntimeError("Memory-mappable model export not found. Run the DVC pipeline first.")
 
-model = joblib.load(MODEL_PATH)
-preprocessor = joblib.load(PREPROCESSOR_PATH)
+        model = ArrayModel.load(MODEL_MMAP_DIR, mmap_mode="r")
+        logging.info(f"Memory-mapped array model export ({model.kind}) from {MODEL_MMAP_DIR}")
+        return ModelBundle(model, compiled_preprocessor=model.preprocessor)
 
-# Define the input schema using Pydantic
+    if not MODEL_PATH.exists() or not PREPROCESSOR_PATH.exists():
+        raise RuntimeError("Model or Preprocessor file not found. Run the DVC pipeline first.")
+
+    import joblib
+    model = joblib.load(MODEL_PATH)
+    preprocessor = joblib.load(PREPROCESSOR_PATH)
+
+    fill_values = None
+    if IMPUTER_PATH.exists():
+        with open(IMPUTER_PATH) as f:
+            fill_values = json.load(f)["fill_values"]
+    else:
+        logging.warning(f"{IMPUTER_PATH} not found; records with missing fields will be rejected")
+
+    # Compile the preprocessor and keep it only if it matches preprocessor.transform bit for bit
+    compiled_preprocessor = None
+    if USE_COMPILED_PREPROCESSOR:
+        try:
+            candidate = CompiledPreprocessor.from_sklearn(preprocessor)
+            if candidate.verify(preprocessor):
+                compiled_preprocessor = candidate
+                logging.info("Compiled preprocessor verified; using pandas-free inference path")
+            else:
+                logging.warning("Compiled preprocessor output differs from preprocessor.transform; using fallback")
+        except Exception as e:
+            logging.warning(f"Could not compile preprocessor, using fallback: {str(e)}")
+
+    return ModelBundle(model, preprocessor, compiled_preprocessor, fill_values)
+
+ARTIFACT_PATHS = {
+    "npz": [MODEL_ARRAY_PATH],
+    "mmap": [MODEL_MMAP_DIR],
+}.get(MODEL_FORMAT, [MODEL_PATH, PREPROCESSOR_PATH] + ([IMPUTER_PATH] if IMPUTER_PATH.exists() else []))
+
+# Model and preprocessor are loaded by start_worker(); later versions are swapped in by the registry
+registry = ModelRegistry(load_bundle, ARTIFACT_PATHS, MODEL_WATCH_INTERVAL_S)
+# Stage latency series are labelled by version; only the active version's are kept
+registry.subscribe(drop_previous_versions)
+
+# Define the input schema using Pydantic; every field is required, and explicit nulls are
+# imputed with the fitted fill values. Unknown keys are rejected so a misspelled field is
+# not silently replaced by a median
 class PatientData(BaseModel):
-    age: int
-    sex: int
-    cp: int
-    trestbps: int
-    chol: int
-    fbs: int
-    restecg: int
-    thalach: int
-    exang: int
-    oldpeak: float
-    slope: int
-    ca: int
-    thal: int
+    model_config = ConfigDict(extra="forbid")
+
+    age: Optional[int]
+    sex: Optional[int]
+    cp: Optional[int]
+    trestbps: Optional[int]
+    chol: Optional[int]
+    fbs: Optional[int]
+    restecg: Optional[int]
+    thalach: Optional[int]
+    exang: Optional[int]
+    oldpeak: Optional[float]
+    slope: Optional[int]
+    ca: Optional[int]
+    thal: Optional[int]
+
+    @model_validator(mode="wrap")
+    @classmethod
+    def _timed_validation(cls, data, handler):
+        # Validation of /predict bodies runs inside FastAPI, before the handler; time it here
+        start = time.perf_counter()
+        try:
+            return handler(data)
+        finally:
+            bundle = registry.current()
+            if bundle is not None:
+                observe_stage("validation", bundle, time.perf_counter() - start)
+
+# Set by start_worker() after the warm-up, so synthetic records are neither monitored nor cached
+drift_monitor = None
+prediction_cache = None
+
+def load_drift_monitor():
+    state_path = DRIFT_PROFILE_PATH.with_suffix(".state.json")
+    if not DRIFT_PROFILE_PATH.exists() or not state_path.exists():
+        logging.warning(f"{DRIFT_PROFILE_PATH} or {state_path} not found; drift monitoring disabled")
+        return None
+    monitor = DriftMonitor.from_profile(DRIFT_PROFILE_PATH, list(PatientData.model_fields), DRIFT_WINDOW_SIZE)
+    logging.info(f"Drift monitor loaded reference profile {DRIFT_PROFILE_PATH}")
+    return monitor
+
+def missing_fields(record: Dict[str, Any]) -> List[str]:
+    """Fields left empty that cannot be scored because no imputer is loaded."""
+    if registry.current().fill_values is not None:
+        return []
+    return [name for name, value in record.items() if value is None]
+
+# Batch input: either a list of patient records or columnar arrays keyed by feature
+class BatchPatientData(BaseModel):
+    patients: Optional[List[Dict[str, Any]]] = None
+    columns: Optional[Dict[str, List[Any]]] = None
+
+def score_records(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Runs one transform and one predict_proba call over validated records."""
+    # Pin the bundle so a concurrent reload cannot mix two model versions in one call
+    bundle = registry.current()
+    # Each stage is exported to predict_stage_duration_seconds{stage, model, version}
+    timer = StageTimer(bundle)
+    if drift_monitor is not None:
+        with timer.stage("drift"):
+            drift_monitor.observe(records)
+
+    # Only payloads not seen recently under this model version are evaluated
+    positive_proba = np.empty(len(records))
+    pending = list(range(len(records)))
+    if prediction_cache is not None:
+        with timer.stage("cache"):
+            keys = [prediction_cache.key(bundle.version, record) for record in records]
+            cached = prediction_cache.get_many(keys)
+            pending = [i for i, probability in enumerate(cached) if probability is None]
+            positive_proba[:] = [np.nan if probability is None else probability for probability in cached]
+
+    if pending:
+        with timer.stage("build_input"):
+            raw = bundle.build_input([records[i] for i in pending])
+        with timer.stage("preprocess"):
+            transformed_data = bundle.preprocess(raw)
+        with timer.stage("predict_proba"):
+            positive_proba[pending] = bundle.model.predict_proba(transformed_data)[:, bundle.positive_idx]
+        if prediction_cache is not None:
+            with timer.stage("cache"):
+                prediction_cache.set_many((keys[i], float(positive_proba[i])) for i in pending)
+
+    with timer.stage("postprocess"):
+        # Derive labels from the single probability evaluation using the decision threshold
+        predictions = (positive_proba > DECISION_THRESHOLD).astype(int)
+        confidences = np.where(predictions == 1, positive_proba, 1.0 - positive_proba)
+
+        return [
+            {
+                "prediction": int(prediction),
+                "status": "Positive" if prediction == 1 else "Negative",
+                "confidence": round(float(confidence), 4),
+                "probability": round(float(probability), 4),
+                "threshold": DECISION_THRESHOLD,
+                "model_version": bundle.version
+            }
+            for prediction, confidence, probability in zip(predictions, confidences, positive_proba)
+        ]
+
+def profiled(fn, *args):
+    """Runs fn on the calling thread under the sampling profiler and saves the folded stacks."""
+    with SamplingProfiler(threading.get_ident(), PROFILE_INTERVAL_S) as profiler:
+        result = fn(*args)
+    path = profiler.save(PROFILE_DIR / f"{datetime.now():%Y%m%d_%H%M%S_%f}_{fn.__name__.strip('_')}.folded")
+    logging.info(f"Request profile ({sum(profiler.samples.values())} samples) saved to {path}")
+    return result, path
+
+micro_batcher = MicroBatcher(score_records, MICRO_BATCH_MAX_SIZE, MICRO_BATCH_MAX_WAIT_MS) if MICRO_BATCH_ENABLED else None
+
+def warm_up(batch_size: int):
+    """Scores synthetic records singly and as a batch so lazy code paths run before real traffic."""
+    if batch_size <= 0:
+        return
+    bundle = registry.current()
+    # Probe records cover every category plus an unknown value; rounded to fit the integer fields
+    probes = bundle.compiled_preprocessor.probe_records() if bundle.compiled_preprocessor is not None else [WARMUP_PATIENT]
+    records = [
+        PatientData.model_validate({k: round(v) for k, v in probes[i % len(probes)].items()}).model_dump()
+        for i in range(batch_size)
+    ]
+    score_records(records[:1])
+    score_records(records)
+
+def start_worker():
+    """Cold-start sequence: load the model, load the drift profile, warm up, then report ready."""
+    global drift_monitor, prediction_cache
+    try:
+        startup.run_phase("load", registry.reload)
+        # Per-worker startup report of resident vs shared memory
+        logging.info(f"Worker memory after model load: {memory_report(MODEL_MMAP_DIR if MODEL_FORMAT == 'mmap' else None)}")
+
+        monitor = startup.run_phase("drift_profile", load_drift_monitor) if DRIFT_ENABLED else None
+        startup.run_phase("warm_up", warm_up, WARMUP_BATCH_SIZE)
+
+        drift_monitor = monitor
+        if PREDICTION_CACHE_SIZE > 0:
+            prediction_cache = PredictionCache(PatientData.model_fields, PREDICTION_CACHE_SIZE, PREDICTION_CACHE_TTL_S)
+            # Entries of a replaced model can never be hit again (the version is part of the key)
+            registry.subscribe(lambda bundle: prediction_cache.clear())
+        registry.start_watching()
+        startup.mark_ready()
+    except Exception as e:
+        startup.mark_failed(e)
+
+def require_ready():
+    if not startup.ready:
+        raise HTTPException(status_code=503, detail="Model is loading; retry when /readyz reports ready.")
+
+@app.get("/healthz")
+def healthz():
+    """Liveness: fails only when startup crashed, so the pod gets restarted."""
+    if startup.error is not None:
+        raise HTTPException(status_code=500, detail=startup.status())
+    return {"status": "alive"}
+
+@app.get("/readyz")
+def readyz():
+    """Readiness: OK once the model is loaded and warmed up; includes the cold-start timings."""
+    if not startup.ready:
+        raise HTTPException(status_code=503, detail=startup.status())
+    return {**startup.status(), "model_version": registry.current().version}
+
+@app.post("/admin/reload")
+def reload_model(force: bool = False):
+    """Reloads the model artifacts now instead of waiting for the watcher."""
+    bundle, swapped = registry.reload(force=force)
+    return {"model_version": bundle.version, "reloaded": swapped}
+
+@app.post("/admin/profile", response_class=PlainTextResponse)
+def profile_workers(seconds: float = 10):
+    """Samples every thread for the given time and returns folded stacks (flame graph input)."""
+    if not PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiling is disabled (PROFILING_ENABLED=0).")
+    with SamplingProfiler(interval_s=PROFILE_INTERVAL_S) as profiler:
+        time.sleep(min(max(seconds, 0), 60))
+    return profiler.folded()
 
 @app.get("/")
 def home():
     return {"message": "Heart Disease Prediction API is running. Visit /docs for Swagger UI."}
 
-@app.post("/predict")
-def predict(data: PatientData):
+def _predict_one(data: PatientData):
     try:
-        # 1. Convert input JSON to DataFrame
-        input_df = pd.DataFrame([data.model_dump()])
-        
-        # 2. Preprocess the data using the saved transformer
-        transformed_data = preprocessor.transform(input_df)
-        
-        # 3. Get Prediction and Probability
-        prediction = model.predict(transformed_data)[0]
-        probability = model.predict_proba(transformed_data)[0]
-        confidence = float(np.max(probability))
-
-        # Log the activity
-        logging.info(f"Request: {data.model_dump()} | Prediction: {prediction} | Confidence: {confidence}")
+        # Preprocess and evaluate the model once; the label comes from the probability
+        result = score_records([data.model_dump()])[0]
+
+        # Log the activity; arguments are formatted later, off the request thread
+        if sample_request_log():
+            logging.info("Request: %s | Prediction: %s | Confidence: %s", data.model_dump(), result['prediction'], result['confidence'])
+
+        return result
+    except Exception as e:
+        logging.error(f"Prediction failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/predict", dependencies=[Depends(require_ready)])
+async def predict(data: PatientData, response: Response, x_profile: Optional[str] = Header(None)):
+    missing = missing_fields(data.model_dump())
+    if missing:
+        raise HTTPException(status_code=422, detail=f"Missing fields {missing} and no imputer is loaded.")
+
+    # A profiled request is scored on its own, outside the micro-batcher
+    if PROFILING_ENABLED and x_profile == "1":
+        result, path = await run_in_threadpool(profiled, _predict_one, data)
+        response.headers["X-Profile-Path"] = str(path)
+        return result
+
+    if micro_batcher is None:
+        return await run_in_threadpool(_predict_one, data)
+
+    try:
+        record = data.model_dump()
+        result = await micro_batcher.submit(record)
+        if sample_request_log():
+            logging.info("Request: %s | Prediction: %s | Confidence: %s", record, result['prediction'], result['confidence'])
+        return result
+    except Exception as e:
+        logging.error(f"Prediction failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _batch_records(data: BatchPatientData) -> List[Dict[str, Any]]:
+    """Normalises the row or columnar batch payload into a list of records."""
+    if (data.patients is None) == (data.columns is None):
+        raise HTTPException(status_code=422, detail="Provide exactly one of 'patients' or 'columns'.")
+
+    if data.patients is not None:
+        return data.patients
+
+    lengths = {len(values) for values in data.columns.values()}
+    if len(lengths) > 1:
+        raise HTTPException(status_code=422, detail="All columns must have the same length.")
+
+    n_rows = lengths.pop() if lengths else 0
+    return [{name: values[i] for name, values in data.columns.items()} for i in range(n_rows)]
+
+@app.post("/predict/batch", dependencies=[Depends(require_ready)])
+def predict_batch(data: BatchPatientData, response: Response, x_profile: Optional[str] = Header(None)):
+    if PROFILING_ENABLED and x_profile == "1":
+        result, path = profiled(_predict_batch, data)
+        response.headers["X-Profile-Path"] = str(path)
+        return result
+    return _predict_batch(data)
+
+def _predict_batch(data: BatchPatientData):
+    records = _batch_records(data)
+
+    if len(records) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch of {len(records)} exceeds the maximum batch size of {MAX_BATCH_SIZE}."
+        )
+
+    # 1. Validate every record individually so one bad row does not fail the batch
+    results: List[Dict[str, Any]] = [None] * len(records)
+    valid_rows, valid_idx = [], []
+    for idx, record in enumerate(records):
+        try:
+            row = PatientData.model_validate(record).model_dump()
+        except ValidationError as e:
+            results[idx] = {
+                "index": idx,
+                "error": e.errors(include_url=False, include_context=False, include_input=False)
+            }
+            continue
+
+        missing = missing_fields(row)
+        if missing:
+            results[idx] = {
+                "index": idx,
+                "error": [{"type": "missing", "loc": [name], "msg": "Field required (no imputer loaded)"} for name in missing]
+            }
+            continue
+
+        valid_rows.append(row)
+        valid_idx.append(idx)
+
+    try:
+        if valid_rows:
+            # 2. One transform and one predict_proba call for the whole batch
+            for idx, result in zip(valid_idx, score_records(valid_rows)):
+                results[idx] = {"index": idx, **result}
+
+        if sample_request_log():
+            logging.info("Batch request: %s records | Valid: %s | Invalid: %s", len(records), len(valid_rows), len(records) - len(valid_rows))
 
         return {
-            "prediction": int(prediction),
-            "status": "Positive" if prediction == 1 else "Negative",
-            "confidence": round(confidence, 4)
+            "results": results,
+            "n_valid": len(valid_rows),
+            "n_invalid": len(records) - len(valid_rows)
         }
     except Exception as e:
-        logging.error(f"Prediction failed: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        logging.error(f"Batch prediction failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
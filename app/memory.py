@@ -0,0 +1,50 @@
+import os
+from pathlib import Path
+
+SMAPS_ROLLUP = Path("/proc/self/smaps_rollup")
+SMAPS = Path("/proc/self/smaps")
+
+
+def _kb_fields(lines, totals):
+    for line in lines:
+        parts = line.split()
+        if len(parts) == 3 and parts[2] == "kB" and parts[0].endswith(":"):
+            key = parts[0][:-1]
+            totals[key] = totals.get(key, 0) + int(parts[1])
+    return totals
+
+
+def memory_report(mapped_prefix=None):
+    """
+    Resident vs shared memory of the current process in KB (Linux only).
+    When mapped_prefix is given, also reports the pages of files under that
+    path, i.e. how much of a memory-mapped model is resident and shared.
+    """
+    if not SMAPS_ROLLUP.exists():
+        return {}
+
+    totals = _kb_fields(SMAPS_ROLLUP.read_text().splitlines(), {})
+    report = {
+        "pid": os.getpid(),
+        "rss_kb": totals.get("Rss", 0),
+        "pss_kb": totals.get("Pss", 0),
+        "shared_kb": totals.get("Shared_Clean", 0) + totals.get("Shared_Dirty", 0),
+        "private_kb": totals.get("Private_Clean", 0) + totals.get("Private_Dirty", 0),
+    }
+
+    if mapped_prefix is not None:
+        prefix = str(Path(mapped_prefix).resolve())
+        mapped, in_mapping = {}, False
+        for line in SMAPS.read_text().splitlines():
+            first = line.split(maxsplit=1)[0]
+            # Mapping header lines start with an address range such as 7f..-7f..
+            if "-" in first and not first.endswith(":"):
+                fields = line.split()
+                in_mapping = len(fields) >= 6 and fields[5].startswith(prefix)
+            elif in_mapping:
+                _kb_fields([line], mapped)
+
+        report["mapped_rss_kb"] = mapped.get("Rss", 0)
+        report["mapped_shared_kb"] = mapped.get("Shared_Clean", 0) + mapped.get("Shared_Dirty", 0)
+
+    return report
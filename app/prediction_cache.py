@@ -0,0 +1,90 @@
+import threading
+import time
+from collections import OrderedDict
+
+from prometheus_client import Counter, Gauge
+
+CACHE_REQUESTS = Counter(
+    "prediction_cache_requests_total",
+    "Prediction cache lookups by result.",
+    ["result"]
+)
+CACHE_EVICTIONS = Counter(
+    "prediction_cache_evictions_total",
+    "Prediction cache entries removed, by reason (capacity, expired, reload).",
+    ["reason"]
+)
+CACHE_SIZE = Gauge(
+    "prediction_cache_entries",
+    "Entries currently held in the prediction cache."
+)
+
+
+class PredictionCache:
+    """
+    Thread-safe LRU cache with a time-to-live for positive-class
+    probabilities. Keys combine the model version with the canonicalized
+    feature values, so a payload re-sent after a model swap is never
+    answered by the old model.
+    """
+
+    def __init__(self, fields, capacity: int = 10000, ttl_s: float = 300):
+        self.fields = list(fields)
+        self.capacity = capacity
+        self.ttl_s = ttl_s
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, version, record):
+        """1 and 1.0 (or a missing field and None) map to the same key."""
+        values = (record.get(field) for field in self.fields)
+        return (version,) + tuple(None if value is None else float(value) for value in values)
+
+    def get_many(self, keys):
+        """Returns the cached value, or None, for each key."""
+        now = time.monotonic()
+        results, expired = [], 0
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] < now:
+                    del self._entries[key]
+                    entry = None
+                    expired += 1
+                if entry is None:
+                    results.append(None)
+                else:
+                    self._entries.move_to_end(key)
+                    results.append(entry[1])
+            size = len(self._entries)
+
+        hits = sum(value is not None for value in results)
+        CACHE_REQUESTS.labels(result="hit").inc(hits)
+        CACHE_REQUESTS.labels(result="miss").inc(len(results) - hits)
+        if expired:
+            CACHE_EVICTIONS.labels(reason="expired").inc(expired)
+            CACHE_SIZE.set(size)
+        return results
+
+    def set_many(self, items):
+        expires_at = time.monotonic() + self.ttl_s
+        evicted = 0
+        with self._lock:
+            for key, value in items:
+                self._entries[key] = (expires_at, value)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                evicted += 1
+            size = len(self._entries)
+
+        if evicted:
+            CACHE_EVICTIONS.labels(reason="capacity").inc(evicted)
+        CACHE_SIZE.set(size)
+
+    def clear(self):
+        with self._lock:
+            cleared = len(self._entries)
+            self._entries.clear()
+        CACHE_EVICTIONS.labels(reason="reload").inc(cleared)
+        CACHE_SIZE.set(0)
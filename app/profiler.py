@@ -0,0 +1,73 @@
+import os
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler for the serving hot path. A background thread
+    samples Python stacks every interval_s and counts them in the collapsed
+    ("folded") format read by flamegraph.pl, speedscope and inferno. Given a
+    thread id only that thread is sampled; otherwise every other thread is,
+    each stack rooted at its thread name.
+
+    Sampling needs the GIL, so stacks inside pure-Python code are taken at
+    most once per interpreter switch interval (5 ms by default).
+    """
+
+    def __init__(self, thread_id=None, interval_s: float = 0.001):
+        self.thread_id = thread_id
+        self.interval_s = interval_s
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval_s):
+            frames = sys._current_frames()
+            if self.thread_id is not None:
+                targets = [(self.thread_id, frames.get(self.thread_id))]
+            else:
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+                targets = [(names.get(ident, str(ident)), frame) for ident, frame in frames.items() if ident != own]
+
+            for root, frame in targets:
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                if stack:
+                    if self.thread_id is None:
+                        stack.append(root)
+                    self.samples[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        """One "frame;frame;... count" line per distinct stack, root first."""
+        return "\n".join(f"{stack} {count}" for stack, count in sorted(self.samples.items()))
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.folded() + "\n")
+        return path
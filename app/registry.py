@@ -0,0 +1,185 @@
+import hashlib
+import logging
+import threading
+import time
+from pathlib import Path
+
+from prometheus_client import Counter, Gauge
+
+MODEL_VERSION = Gauge(
+    "model_version_info",
+    "Active model version; the series labelled with the current hash is set to 1.",
+    ["version"]
+)
+MODEL_RELOADS = Counter(
+    "model_reloads_total",
+    "Model reload attempts by result.",
+    ["result"]
+)
+
+MODEL_NAMES = {"RandomForestClassifier": "random_forest", "LogisticRegression": "logistic_regression"}
+
+
+class ModelBundle:
+    """A model and the preprocessor (and imputer) it was trained with, swapped together."""
+
+    def __init__(self, model, preprocessor=None, compiled_preprocessor=None, fill_values=None):
+        self.model = model
+        self.preprocessor = preprocessor
+        self.compiled_preprocessor = compiled_preprocessor
+
+        # Column -> fill value for missing fields; None means missing fields cannot be scored
+        if fill_values is not None and compiled_preprocessor is not None:
+            compiled_preprocessor.set_fill_values(fill_values)
+        elif fill_values is None and compiled_preprocessor is not None and compiled_preprocessor.fill_values is not None:
+            fill_values = dict(zip(compiled_preprocessor.input_columns, compiled_preprocessor.fill_values.tolist()))
+        self.fill_values = fill_values
+        self.positive_idx = list(model.classes_).index(1)
+        # Same name whether the model is served from the pickle or the array export
+        self.name = getattr(model, "kind", None) or MODEL_NAMES.get(type(model).__name__, type(model).__name__)
+        self.version = None
+        self.loaded_at = None
+
+    def build_input(self, records):
+        """Raw model input: a float array for the compiled path, else a DataFrame with fill values applied."""
+        if self.compiled_preprocessor is not None:
+            return self.compiled_preprocessor.to_array(records)
+        import pandas as pd
+        df = pd.DataFrame(records, columns=list(self.preprocessor.feature_names_in_))
+        if self.fill_values is not None:
+            df = df.fillna(self.fill_values)
+        return df
+
+    def preprocess(self, raw):
+        if self.compiled_preprocessor is not None:
+            return self.compiled_preprocessor.transform(raw)
+        return self.preprocessor.transform(raw)
+
+    def transform(self, records):
+        """Preprocesses validated records, preferring the compiled NumPy path."""
+        return self.preprocess(self.build_input(records))
+
+    def warm_up(self):
+        """Runs one prediction so the first real request does not pay for lazy code paths."""
+        if self.compiled_preprocessor is not None:
+            self.model.predict_proba(self.transform(self.compiled_preprocessor.probe_records()))
+
+
+class ModelRegistry:
+    """
+    Holds the active ModelBundle and replaces it when the artifacts change.
+    A new bundle is fully loaded and warmed up before the reference is
+    swapped, so in-flight requests finish on the bundle they started with.
+    """
+
+    def __init__(self, loader, artifact_paths, poll_interval: float = 0):
+        self.loader = loader
+        self.artifact_paths = [Path(p) for p in artifact_paths]
+        self.poll_interval = poll_interval
+        self._bundle = None
+        self._loaded_signature = None
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher = None
+        self._subscribers = []
+
+    def current(self) -> ModelBundle:
+        return self._bundle
+
+    def subscribe(self, callback):
+        """Calls callback(bundle) after every swap, e.g. to drop state tied to the old model."""
+        self._subscribers.append(callback)
+
+    def _files(self):
+        files = []
+        for path in self.artifact_paths:
+            files.extend(sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path])
+        return files
+
+    def _signature(self):
+        """Cheap change detector based on file sizes and modification times."""
+        signature = []
+        for f in self._files():
+            try:
+                stat = f.stat()
+                signature.append((str(f), stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append((str(f), None, None))
+        return tuple(signature)
+
+    def _content_hash(self):
+        digest = hashlib.sha256()
+        for f in self._files():
+            digest.update(f.name.encode())
+            with open(f, "rb") as fh:
+                for chunk in iter(lambda: fh.read(1 << 20), b""):
+                    digest.update(chunk)
+        return digest.hexdigest()[:12]
+
+    def reload(self, force: bool = False):
+        """Loads the artifacts if their content changed. Returns (bundle, swapped)."""
+        with self._reload_lock:
+            try:
+                signature = self._signature()
+                version = self._content_hash()
+                if not force and self._bundle is not None and version == self._bundle.version:
+                    self._loaded_signature = signature
+                    return self._bundle, False
+
+                bundle = self.loader()
+                bundle.warm_up()
+
+                # Artifacts rewritten while loading: keep the old bundle and retry later
+                if self._content_hash() != version:
+                    raise RuntimeError("Artifacts changed during reload")
+
+                bundle.version = version
+                bundle.loaded_at = time.time()
+            except Exception:
+                MODEL_RELOADS.labels(result="failure").inc()
+                if self._bundle is None:
+                    raise
+                logging.exception("Model reload failed; keeping the active version")
+                return self._bundle, False
+
+            previous = self._bundle
+            self._bundle = bundle
+            self._loaded_signature = signature
+
+            if previous is not None:
+                MODEL_VERSION.remove(previous.version)
+            MODEL_VERSION.labels(version=version).set(1)
+            MODEL_RELOADS.labels(result="success").inc()
+            logging.info(f"Active model version: {version} (previous: {previous.version if previous else None})")
+            for callback in self._subscribers:
+                callback(bundle)
+            return bundle, True
+
+    def start_watching(self):
+        if self.poll_interval <= 0 or self._watcher is not None:
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, name="model-registry-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self):
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def _watch(self):
+        pending = None
+        while not self._stop.wait(self.poll_interval):
+            signature = self._signature()
+            if signature == self._loaded_signature:
+                pending = None
+                continue
+
+            # Wait until the files stop changing for one interval before loading
+            if signature != pending:
+                pending = signature
+                continue
+
+            self.reload()
+            pending = None
@@ -0,0 +1,62 @@
+import logging
+import threading
+import time
+
+from prometheus_client import Gauge
+
+STARTUP_SECONDS = Gauge(
+    "api_startup_seconds",
+    "Duration of each cold-start phase of this worker (import, load, warm_up, ...).",
+    ["phase"]
+)
+READY = Gauge(
+    "api_ready",
+    "1 once the model is loaded and warmed up and the worker accepts predictions."
+)
+
+
+class StartupState:
+    """
+    Tracks the cold start of a worker: the duration of each phase, whether
+    it finished (ready) or failed. Backs the /healthz and /readyz probes.
+    """
+
+    def __init__(self):
+        self.timings = {}
+        self.error = None
+        self._ready = threading.Event()
+
+    def record(self, phase, seconds):
+        self.timings[phase] = seconds
+        STARTUP_SECONDS.labels(phase=phase).set(seconds)
+
+    def run_phase(self, phase, fn, *args):
+        start = time.perf_counter()
+        result = fn(*args)
+        self.record(phase, time.perf_counter() - start)
+        return result
+
+    def mark_ready(self):
+        self.record("total", sum(seconds for phase, seconds in self.timings.items() if phase != "total"))
+        self._ready.set()
+        READY.set(1)
+        logging.info("Startup complete: " + ", ".join(f"{phase} {seconds:.3f}s" for phase, seconds in self.timings.items()))
+
+    def mark_failed(self, error):
+        self.error = f"{type(error).__name__}: {error}"
+        logging.error(f"Startup failed: {self.error}")
+
+    @property
+    def ready(self):
+        return self._ready.is_set()
+
+    def wait(self, timeout=None) -> bool:
+        """Blocks until the worker is ready (True) or the timeout expires (False)."""
+        return self._ready.wait(timeout)
+
+    def status(self):
+        return {
+            "ready": self.ready,
+            "error": self.error,
+            "timings_s": {phase: round(seconds, 4) for phase, seconds in self.timings.items()},
+        }
@@ -0,0 +1,71 @@
+"""
+/predict throughput with per-request logging off, synchronous, queued,
+and queued with sampling. Each mode runs in a fresh interpreter because
+the logging setup is read from the environment when app.main is imported.
+The NumPy model export (MODEL_FORMAT=npz) keeps inference cheap enough for
+the logging cost to show; the prediction cache is off so every call scores.
+
+Usage: python benchmarks/api_logging.py [n_requests]   (default 3000)
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+MODES = {
+    "logging off": {"REQUEST_LOG_SAMPLE_RATE": "0"},
+    "sync": {"API_LOG_ASYNC": "0", "REQUEST_LOG_SAMPLE_RATE": "1"},
+    "queued": {"API_LOG_ASYNC": "1", "REQUEST_LOG_SAMPLE_RATE": "1"},
+    "queued, 10% sampled": {"API_LOG_ASYNC": "1", "REQUEST_LOG_SAMPLE_RATE": "0.1"},
+}
+
+SAMPLE_PATIENT = {
+    "age": 63, "sex": 1, "cp": 1, "trestbps": 145, "chol": 233,
+    "fbs": 1, "restecg": 2, "thalach": 150, "exang": 0,
+    "oldpeak": 2.3, "slope": 3, "ca": 0, "thal": 6
+}
+
+
+def run_mode(n_requests):
+    """Child process: requests per second for the handler body and through the ASGI stack."""
+    from fastapi.testclient import TestClient
+    from app import main
+
+    # The lifespan loads and warms up the model before the first timed request
+    with TestClient(main.app) as client:
+        main.startup.wait()
+        data = main.PatientData(**SAMPLE_PATIENT)
+        for _ in range(100):
+            main._predict_one(data)
+
+        start = time.perf_counter()
+        for _ in range(n_requests):
+            main._predict_one(data)
+        handler_rps = n_requests / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for _ in range(n_requests // 3):
+            client.post("/predict", json=SAMPLE_PATIENT)
+        http_rps = (n_requests // 3) / (time.perf_counter() - start)
+    print(json.dumps({"handler_rps": handler_rps, "http_rps": http_rps}))
+
+
+def main():
+    n_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    print(f"{'mode':<22}{'handler req/s':>15}{'HTTP req/s':>12}")
+    for mode, env in MODES.items():
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", str(n_requests)],
+            env={**os.environ, "MODEL_FORMAT": "npz", "DRIFT_ENABLED": "0", "PREDICTION_CACHE_SIZE": "0", **env},
+            capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{mode:<22}{result['handler_rps']:>15,.0f}{result['http_rps']:>12,.0f}")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        run_mode(int(sys.argv[2]))
+    else:
+        main()
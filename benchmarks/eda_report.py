@@ -0,0 +1,38 @@
+"""
+Per-figure EDA report time, default mode (seaborn over every row, serial)
+versus fast mode (NumPy summaries, sampled KDE, process pool), on the
+processed dataset resampled to n_rows.
+
+Usage: python benchmarks/eda_report.py [n_rows] [dpi]   (default 1,000,000 rows, 300 dpi)
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+from src.eda import EDAAutomator
+from src.storage import table_path, read_table, write_table
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    dpi = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+
+    df = read_table(table_path("data/processed/heart_cleaned"))
+    df = df.sample(n=n_rows, replace=True, random_state=0).reset_index(drop=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = write_table(df, Path(tmp) / "eda_benchmark")
+        results = {}
+        for fast in (False, True):
+            eda = EDAAutomator(data_path, fast=fast, dpi=dpi)
+            eda.report_dir = Path(tmp)
+            results["fast" if fast else "default"] = eda.run_full_report()
+
+    print(f"rows: {n_rows:,}  dpi: {dpi}")
+    print(f"{'step':<26}{'default s':>12}{'fast s':>10}")
+    for step in results["default"]:
+        print(f"{step:<26}{results['default'][step]:>12.2f}{results['fast'][step]:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Micro-benchmark of per-request inference latency for the two model families
+trained by ModelTrainer. Compares the previous predict + predict_proba double
+evaluation against a single predict_proba call with a decision threshold.
+
+Usage: python benchmarks/inference_latency.py [n_requests]
+"""
+import sys
+import time
+import warnings
+import joblib
+import numpy as np
+from pathlib import Path
+from sklearn.linear_model import LogisticRegression
+from sklearn.ensemble import RandomForestClassifier
+
+from src.storage import read_table
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+PROCESSED_DATA_PATH = PROJECT_ROOT / "data" / "processed" / "heart_cleaned"
+PREPROCESSOR_PATH = PROJECT_ROOT / "models" / "preprocessor.pkl"
+THRESHOLD = 0.5
+
+
+def before(model, row):
+    prediction = model.predict(row)[0]
+    probability = model.predict_proba(row)[0]
+    return prediction, float(np.max(probability))
+
+
+def after(model, row):
+    positive_proba = model.predict_proba(row)[0, 1]
+    prediction = int(positive_proba > THRESHOLD)
+    return prediction, positive_proba if prediction else 1.0 - positive_proba
+
+
+def time_per_request(fn, model, rows):
+    start = time.perf_counter()
+    for row in rows:
+        fn(model, row)
+    return (time.perf_counter() - start) / len(rows) * 1000
+
+
+def main(n_requests=200):
+    warnings.filterwarnings("ignore")
+    df = read_table(PROCESSED_DATA_PATH)
+    preprocessor = joblib.load(PREPROCESSOR_PATH)
+    X = preprocessor.transform(df.drop(columns=["target"]))
+    y = df["target"]
+
+    # Same families as ModelTrainer, with the largest RF grid point
+    models = {
+        "Logistic_Regression": LogisticRegression(max_iter=1000).fit(X, y),
+        "Random_Forest": RandomForestClassifier(n_estimators=200, random_state=42).fit(X, y),
+    }
+
+    rows = [X[i % len(X)].reshape(1, -1) for i in range(n_requests)]
+    print(f"{'model':<22}{'before (ms)':>14}{'after (ms)':>14}{'speedup':>10}")
+    for name, model in models.items():
+        t_before = time_per_request(before, model, rows)
+        t_after = time_per_request(after, model, rows)
+        print(f"{name:<22}{t_before:>14.3f}{t_after:>14.3f}{t_before / t_after:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
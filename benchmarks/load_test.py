@@ -0,0 +1,295 @@
+"""
+Load test of the prediction API per model type. For each model family
+(the latest finished MLflow run of that name, as logged by ModelTrainer)
+a temporary models/ directory is laid out with the family's model, the
+shared preprocessor and imputer, and its npz/mmap exports. For each model
+format (MODEL_FORMAT) the app is then started with uvicorn on localhost
+against that directory, and PatientData payloads are replayed against
+/predict and /predict/batch by a fixed number of concurrent clients.
+Throughput and p50/p95/p99 latency per model, format and endpoint are
+printed and saved as JSON, with the estimator class and run ID of every
+model; pass --baseline with an earlier result file to print the change
+against it.
+
+Payloads are rows of the processed data (random values in the feature
+ranges when it is missing), or recorded traffic from --traffic, a JSONL
+file with one PatientData object per line. The prediction cache is off
+unless --cache is given, so every request reaches the model. Client and
+server share the machine, so compare runs from the same host only.
+
+Usage: python benchmarks/load_test.py [--models Logistic_Regression,Random_Forest]
+       [--formats pickle,npz] [--concurrency 8]
+       [--requests 2000] [--batch-size 32] [--traffic traffic.jsonl]
+       [--output reports/load_test.json] [--baseline previous.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+import joblib
+import mlflow
+import numpy as np
+from mlflow.tracking import MlflowClient
+
+from src.model_export import ModelExporter
+from src.storage import read_table, table_path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+PROCESSED_DATA_PATH = PROJECT_ROOT / "data" / "processed" / "heart_cleaned"
+FEATURE_RANGES = {
+    "age": (29, 77), "sex": (0, 1), "cp": (1, 4), "trestbps": (94, 200), "chol": (126, 564),
+    "fbs": (0, 1), "restecg": (0, 2), "thalach": (71, 202), "exang": (0, 1),
+    "oldpeak": (0.0, 6.2), "slope": (1, 3), "ca": (0, 3), "thal": (3, 7)
+}
+PERCENTILES = (50, 95, 99)
+MODEL_FORMATS = ("pickle", "npz", "mmap")
+EXPERIMENT_NAME = "Heart_Disease_Classification"
+
+
+def load_payloads(traffic, n):
+    """Recorded traffic, else processed data rows, else random values in the feature ranges."""
+    if traffic:
+        with open(traffic) as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    path = table_path(str(PROCESSED_DATA_PATH))
+    if os.path.exists(path):
+        data = read_table(path)[list(FEATURE_RANGES)].dropna()
+        rows = data.sample(n, replace=len(data) < n, random_state=42)
+        return [{k: (float(v) if k == "oldpeak" else int(v)) for k, v in row.items()} for row in rows.to_dict("records")]
+
+    rng = np.random.default_rng(42)
+    return [
+        {k: (round(float(rng.uniform(lo, hi)), 1) if k == "oldpeak" else int(rng.integers(lo, hi + 1)))
+         for k, (lo, hi) in FEATURE_RANGES.items()}
+        for _ in range(n)
+    ]
+
+
+def prepare_model(run_name, serving_dir):
+    """
+    Lays out serving_dir/models/ with the model of the latest finished run
+    named run_name and its array exports; returns that run's details.
+    """
+    client = MlflowClient()
+    experiment = client.get_experiment_by_name(EXPERIMENT_NAME)
+    runs = client.search_runs(
+        experiment_ids=[experiment.experiment_id],
+        filter_string=f"tags.mlflow.runName = '{run_name}' and attributes.status = 'FINISHED'",
+        order_by=["attributes.start_time DESC"],
+        max_results=1
+    ) if experiment else []
+    if not runs:
+        raise RuntimeError(f"No finished {run_name} run in the {EXPERIMENT_NAME} experiment; run the training stage first")
+    run_id = runs[0].info.run_id
+
+    models_dir = serving_dir / "models"
+    models_dir.mkdir(parents=True)
+    local_path = mlflow.artifacts.download_artifacts(run_id=run_id, artifact_path="model", dst_path=str(serving_dir / "download"))
+    shutil.copy(Path(local_path) / "model.pkl", models_dir / "best_model.pkl")
+    # Every family is trained on the same preprocessed data
+    for name in ("preprocessor.pkl", "imputer.json"):
+        if (PROJECT_ROOT / "models" / name).exists():
+            shutil.copy(PROJECT_ROOT / "models" / name, models_dir / name)
+
+    exporter = ModelExporter()
+    exporter.model_path = models_dir / "best_model.pkl"
+    exporter.preprocessor_path = models_dir / "preprocessor.pkl"
+    exporter.imputer_path = models_dir / "imputer.json"
+    exporter.export_path = models_dir / "best_model.npz"
+    exporter.mmap_dir = models_dir / "best_model_mmap"
+    exporter.export()
+
+    # The app also reads reports/ (drift profile) relative to its working directory
+    if (PROJECT_ROOT / "reports").exists():
+        (serving_dir / "reports").symlink_to(PROJECT_ROOT / "reports", target_is_directory=True)
+    return {"run_id": run_id, "estimator": type(joblib.load(models_dir / "best_model.pkl")).__name__}
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(model_format, port, cache, serving_dir, timeout=120):
+    # Run from serving_dir so the app's relative models/ paths point at the model under test
+    pythonpath = os.pathsep.join(filter(None, [str(PROJECT_ROOT), os.environ.get("PYTHONPATH")]))
+    env = {**os.environ, "MODEL_FORMAT": model_format, "PYTHONPATH": pythonpath}
+    if not cache:
+        env["PREDICTION_CACHE_SIZE"] = "0"
+    # Server output goes to a file: an unread pipe would fill up and block the server
+    log = tempfile.TemporaryFile(mode="w+")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=serving_dir, env=env, stdout=log, stderr=subprocess.STDOUT
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            log.seek(0)
+            raise RuntimeError(f"Server exited on startup:\n{log.read()[-2000:]}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/readyz", timeout=1).status_code == 200:
+                return server
+        except httpx.TransportError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError(f"Server not ready after {timeout}s")
+
+
+async def replay(base_url, path, bodies, concurrency, records_per_request):
+    """Closed-loop replay: each client sends its next request as soon as the previous one returns."""
+    latencies, errors = [], 0
+    queue = iter(bodies)
+
+    async def client(session):
+        nonlocal errors
+        for body in queue:
+            start = time.perf_counter()
+            try:
+                response = await session.post(path, json=body)
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            latencies.append(time.perf_counter() - start)
+            errors += not ok
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as session:
+        start = time.perf_counter()
+        await asyncio.gather(*(client(session) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    result = {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "requests_per_s": round(len(latencies) / elapsed, 1),
+        "records_per_s": round(len(latencies) * records_per_request / elapsed, 1),
+        "mean_ms": round(float(latencies_ms.mean()), 3),
+    }
+    result.update({f"p{p}_ms": round(float(np.percentile(latencies_ms, p)), 3) for p in PERCENTILES})
+    return result
+
+
+def run_format(model_format, serving_dir, payloads, args):
+    port = free_port()
+    server = start_server(model_format, port, args.cache, serving_dir)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        singles = [payloads[i % len(payloads)] for i in range(args.requests)]
+        n_batches = max(1, args.requests // args.batch_size)
+        batches = [
+            {"patients": [payloads[(b * args.batch_size + i) % len(payloads)] for i in range(args.batch_size)]}
+            for b in range(n_batches)
+        ]
+
+        results = {}
+        for endpoint, path, bodies, size in (("predict", "/predict", singles, 1), ("predict_batch", "/predict/batch", batches, args.batch_size)):
+            asyncio.run(replay(base_url, path, bodies[:args.warmup], args.concurrency, size))
+            results[endpoint] = asyncio.run(replay(base_url, path, bodies, args.concurrency, size))
+        return results
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def print_results(results, baseline=None):
+    print(f"{'model':<22}{'format':<8}{'endpoint':<15}{'req/s':>9}{'rec/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+    for model, formats in results.items():
+        for model_format, endpoints in formats.items():
+            for endpoint, r in endpoints.items():
+                if "error" in r:
+                    print(f"{model:<22}{model_format:<8}{endpoint:<15}  {r['error'].splitlines()[0]}")
+                    continue
+                print(f"{model:<22}{model_format:<8}{endpoint:<15}{r['requests_per_s']:>9,.0f}{r['records_per_s']:>10,.0f}"
+                      f"{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}{r['p99_ms']:>9.2f}{r['errors']:>8}")
+                base = (baseline or {}).get(model, {}).get(model_format, {}).get(endpoint)
+                if base and "error" not in base:
+                    print(f"{'':<30}{'vs baseline':<15}{_change(r, base, 'requests_per_s'):>9}{_change(r, base, 'records_per_s'):>10}"
+                          f"{_change(r, base, 'p50_ms'):>9}{_change(r, base, 'p95_ms'):>9}{_change(r, base, 'p99_ms'):>9}")
+
+
+def _change(result, base, key):
+    return f"{(result[key] / base[key] - 1) * 100:+.0f}%" if base[key] else "n/a"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--models", default="Logistic_Regression,Random_Forest", help="comma-separated MLflow run names of the model families")
+    parser.add_argument("--formats", default="pickle,npz", help="comma-separated MODEL_FORMAT values")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=2000, help="requests per endpoint (batch endpoint: requests // batch-size)")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--traffic", help="JSONL file of recorded PatientData payloads")
+    parser.add_argument("--cache", action="store_true", help="keep the prediction cache enabled")
+    parser.add_argument("--output", default=str(PROJECT_ROOT / "reports" / f"load_test_{datetime.now():%Y%m%d_%H%M%S}.json"))
+    parser.add_argument("--baseline", help="earlier result file to compare against")
+    args = parser.parse_args()
+
+    formats = [f for f in args.formats.split(",") if f]
+    unknown = set(formats) - set(MODEL_FORMATS)
+    if unknown:
+        parser.error(f"unknown formats {sorted(unknown)}; choose from {MODEL_FORMATS}")
+
+    payloads = load_payloads(args.traffic, max(args.requests, 1000))
+    models, results = {}, {}
+    for run_name in [m for m in args.models.split(",") if m]:
+        with tempfile.TemporaryDirectory() as tmp:
+            serving_dir = Path(tmp)
+            try:
+                models[run_name] = prepare_model(run_name, serving_dir)
+            except Exception as e:
+                results[run_name] = {"-": {"export": {"error": str(e)}}}
+                continue
+
+            results[run_name] = {}
+            for model_format in formats:
+                try:
+                    results[run_name][model_format] = run_format(model_format, serving_dir, payloads, args)
+                except RuntimeError as e:
+                    results[run_name][model_format] = {"server": {"error": str(e)}}
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    print_results(results, baseline)
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "host": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "baseline")},
+        "models": models,
+        "results": results,
+    }
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
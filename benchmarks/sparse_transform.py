@@ -0,0 +1,84 @@
+"""
+Dense versus sparse output of the transform stage once a high-cardinality
+categorical field (e.g. a site or ICD code with n_levels values) is added
+to the UCI features. Measures encode + persist time, peak traced memory and
+artifact size, then fits a logistic regression on the stored artifact.
+
+Usage: python benchmarks/sparse_transform.py [n_rows] [n_levels]   (default 50,000 x 2,000)
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+from src.storage import read_sparse, read_table, write_sparse, write_table
+
+NUMERICAL = ['age', 'trestbps', 'chol', 'thalach', 'oldpeak']
+CATEGORICAL = ['sex', 'cp', 'fbs', 'restecg', 'exang', 'slope', 'ca', 'thal', 'site']
+
+
+def make_dataset(n_rows, n_levels, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({col: rng.normal(100, 20, n_rows) for col in NUMERICAL})
+    for col in CATEGORICAL[:-1]:
+        df[col] = rng.integers(0, 4, n_rows).astype(np.float64)
+    df["site"] = rng.integers(0, n_levels, n_rows).astype(np.float64)
+    return df, rng.integers(0, 2, n_rows)
+
+
+def run(df, target, sparse, out_dir):
+    preprocessor = ColumnTransformer(
+        [("num_pipeline", StandardScaler(), NUMERICAL), ("cat_pipeline", OneHotEncoder(handle_unknown='ignore'), CATEGORICAL)],
+        sparse_threshold=1.0 if sparse else 0.3
+    )
+    tracemalloc.start()
+    start = time.perf_counter()
+    features = preprocessor.fit_transform(df)
+    names = preprocessor.get_feature_names_out()
+    if sparse:
+        path = write_sparse(features, target, names, out_dir / "sparse")
+    else:
+        features = features.toarray() if hasattr(features, "toarray") else features
+        table = pd.DataFrame(features, columns=names)
+        table["target"] = target
+        path = write_table(table, out_dir / "dense", fmt="parquet", export_csv=False)
+        del table
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del features
+
+    # Training input as ModelTrainer loads it
+    start = time.perf_counter()
+    if sparse:
+        X, y, _ = read_sparse(path)
+    else:
+        loaded = read_table(path)
+        X, y = loaded.drop(columns=["target"]), loaded["target"]
+    LogisticRegression(max_iter=200).fit(X, y)
+    return seconds, peak, os.path.getsize(path), time.perf_counter() - start
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    n_levels = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+    df, target = make_dataset(n_rows, n_levels)
+
+    print(f"{n_rows:,} rows, site with {n_levels:,} levels")
+    print(f"{'output':<8}{'encode+save s':>15}{'peak MB':>10}{'file MB':>10}{'load+fit s':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for sparse in (False, True):
+            seconds, peak, size, fit_seconds = run(df, target, sparse, Path(tmp))
+            print(f"{'sparse' if sparse else 'dense':<8}{seconds:>15.2f}{peak / 1e6:>10.0f}{size / 1e6:>10.1f}{fit_seconds:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Wall-clock time of ModelTrainer's hyperparameter search for increasing
+n_jobs, serial vs concurrent model families. MLflow is not touched and
+the pipeline cache is off, so every configuration refits from scratch.
+
+Usage: python benchmarks/trainer_parallel.py
+"""
+import os
+import time
+from sklearn.model_selection import train_test_split
+
+from src.cache import StageCache
+from src.model_trainer import ModelTrainer
+from src.storage import read_table
+
+
+def main():
+    trainer = ModelTrainer()
+    # The CV-score cache ignores n_jobs, so every run after the first would be a cache hit
+    trainer.cache = StageCache(enabled=False)
+    df = read_table(trainer.data_path)
+    X_train, _, y_train, _ = train_test_split(
+        df.drop(columns=["target"]), df["target"], test_size=0.2, random_state=42
+    )
+    models = trainer.get_model_configs()
+
+    cores = os.cpu_count() or 1
+    job_counts = sorted({1, 2, 4, cores} & set(range(1, cores + 1)))
+
+    baseline = None
+    print(f"cores available: {cores}")
+    print(f"{'n_jobs':>7}{'families':>12}{'seconds':>10}{'speedup':>10}")
+    for n_jobs in job_counts:
+        for parallel_families in (False, True):
+            trainer.n_jobs, trainer.parallel_families = n_jobs, parallel_families
+            start = time.perf_counter()
+            trainer.fit_searches(models, X_train, y_train)
+            elapsed = time.perf_counter() - start
+
+            baseline = baseline or elapsed
+            mode = "parallel" if parallel_families else "serial"
+            print(f"{n_jobs:>7}{mode:>12}{elapsed:>10.2f}{baseline / elapsed:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+import numpy as np
+from pathlib import Path
+
+from src.compiled_preprocessor import CompiledPreprocessor
+
+
+class ArrayModel:
+    """
+    NumPy-only predictor for the exported best model. Holds the compiled
+    preprocessor plus either logistic regression coefficients or a forest
+    flattened into node arrays, so serving needs neither sklearn nor pandas.
+    """
+
+    def __init__(self, kind, classes, arrays, preprocessor=None):
+        self.kind = kind
+        self.classes_ = np.asarray(classes)
+        self.arrays = arrays
+        self.preprocessor = preprocessor
+
+        if kind == "random_forest":
+            self.n_trees = len(arrays["tree_offsets"])
+            self.max_depth = int(arrays["tree_max_depth"])
+        elif kind != "logistic_regression":
+            raise ValueError(f"Unsupported model kind: {kind}")
+
+    @staticmethod
+    def model_to_arrays(model):
+        """Flattens a fitted LogisticRegression or RandomForestClassifier."""
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.ensemble import RandomForestClassifier
+
+        if isinstance(model, LogisticRegression):
+            if len(model.classes_) != 2:
+                raise ValueError("Only binary LogisticRegression is supported.")
+            return {
+                "model_kind": np.array("logistic_regression"),
+                "classes": model.classes_,
+                "coef": model.coef_,
+                "intercept": model.intercept_,
+            }
+
+        if isinstance(model, RandomForestClassifier):
+            left, right, feature, threshold, value, offsets = [], [], [], [], [], []
+            offset, max_depth = 0, 0
+            for estimator in model.estimators_:
+                tree = estimator.tree_
+                nodes = np.arange(tree.node_count)
+                is_leaf = tree.children_left == -1
+
+                # Leaves point at themselves so traversal can run a fixed number of steps
+                left.append(np.where(is_leaf, nodes, tree.children_left) + offset)
+                right.append(np.where(is_leaf, nodes, tree.children_right) + offset)
+                feature.append(np.where(is_leaf, 0, tree.feature))
+                threshold.append(tree.threshold)
+
+                # Normalise node values the same way DecisionTreeClassifier.predict_proba does
+                node_value = tree.value[:, 0, :model.n_classes_].astype(np.float64)
+                normalizer = node_value.sum(axis=1)[:, np.newaxis]
+                normalizer[normalizer == 0.0] = 1.0
+                value.append(node_value / normalizer)
+
+                offsets.append(offset)
+                offset += tree.node_count
+                max_depth = max(max_depth, tree.max_depth)
+
+            return {
+                "model_kind": np.array("random_forest"),
+                "classes": model.classes_,
+                "tree_children_left": np.concatenate(left).astype(np.int32),
+                "tree_children_right": np.concatenate(right).astype(np.int32),
+                "tree_feature": np.concatenate(feature).astype(np.int32),
+                "tree_threshold": np.concatenate(threshold),
+                "tree_value": np.concatenate(value),
+                "tree_offsets": np.array(offsets, dtype=np.int32),
+                "tree_max_depth": np.array(max_depth),
+            }
+
+        raise ValueError(f"Unsupported model type: {type(model).__name__}")
+
+    @classmethod
+    def load(cls, path, mmap_mode=None):
+        """
+        Loads an export written by src/model_export.py. A directory of .npy
+        files can be memory-mapped (mmap_mode='r') so worker processes share
+        the model arrays through the page cache instead of copying them.
+        """
+        path = Path(path)
+        if path.is_dir():
+            arrays = {
+                npy.stem: np.load(npy, mmap_mode=mmap_mode, allow_pickle=False)
+                for npy in sorted(path.glob("*.npy"))
+            }
+        else:
+            with np.load(path, allow_pickle=False) as npz:
+                arrays = {key: npz[key] for key in npz.files}
+
+        preprocessor_arrays = {key[len("pre_"):]: val for key, val in arrays.items() if key.startswith("pre_")}
+        preprocessor = CompiledPreprocessor.from_arrays(preprocessor_arrays) if preprocessor_arrays else None
+        return cls(str(arrays["model_kind"]), arrays["classes"], arrays, preprocessor)
+
+    def predict_proba(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        if self.kind == "logistic_regression":
+            return self._predict_proba_lr(X)
+        return self._predict_proba_forest(X)
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    def _predict_proba_lr(self, X):
+        decision = X @ self.arrays["coef"].T + self.arrays["intercept"]
+        positive = 1.0 / (1.0 + np.exp(-decision[:, 0]))
+        return np.vstack([1 - positive, positive]).T
+
+    def _predict_proba_forest(self, X):
+        a = self.arrays
+        # Trees compare float32 inputs against float64 thresholds, like sklearn
+        X32 = X.astype(np.float32)
+        rows = np.arange(X.shape[0])[:, np.newaxis]
+
+        # Walk every tree for every row at once; leaves loop onto themselves
+        nodes = np.broadcast_to(a["tree_offsets"], (X.shape[0], self.n_trees))
+        for _ in range(self.max_depth):
+            go_left = X32[rows, a["tree_feature"][nodes]] <= a["tree_threshold"][nodes]
+            nodes = np.where(go_left, a["tree_children_left"][nodes], a["tree_children_right"][nodes])
+
+        # Accumulate tree by tree in estimator order, as RandomForestClassifier does
+        leaf_values = a["tree_value"][nodes]
+        proba = np.zeros((X.shape[0], leaf_values.shape[2]), dtype=np.float64)
+        for t in range(self.n_trees):
+            proba += leaf_values[:, t]
+        proba /= self.n_trees
+        return proba
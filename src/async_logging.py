@@ -0,0 +1,60 @@
+import atexit
+import logging
+import queue
+import random
+from logging.handlers import QueueHandler, QueueListener
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that never blocks the caller: records are dropped (and counted) when the queue is full."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # The queue stays in-process, so message formatting can be left to the listener thread
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def enable_queue_logging(logger: logging.Logger, handlers=None, max_queue_size: int = 10000) -> QueueListener:
+    """
+    Puts the given handlers (default: the logger's current ones) behind a
+    queue. The calling thread only enqueues the record; a background
+    QueueListener formats and writes it. The listener is flushed and
+    stopped at interpreter exit.
+    """
+    if handlers is None:
+        handlers = list(logger.handlers)
+        for handler in handlers:
+            logger.removeHandler(handler)
+
+    log_queue = queue.Queue(max_queue_size)
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    logger.addHandler(DroppingQueueHandler(log_queue))
+
+    listener.start()
+    atexit.register(_stop_listener, listener)
+    return listener
+
+
+def _stop_listener(listener: QueueListener):
+    # QueueListener.stop fails when called twice (e.g. explicitly, then at exit)
+    if listener._thread is not None:
+        listener.stop()
+
+
+class RequestLogSampler:
+    """Decides which per-request log lines are written; rate 1 logs all, 0 none."""
+
+    def __init__(self, rate: float = 1.0):
+        self.rate = rate
+
+    def __call__(self) -> bool:
+        return self.rate >= 1 or (self.rate > 0 and random.random() < self.rate)
@@ -0,0 +1,168 @@
+import os
+import sys
+import json
+import time
+import argparse
+import warnings
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from src.compiled_preprocessor import CompiledPreprocessor
+from src.logger import logger
+from src.exception import CustomException
+from src.storage import TableWriter
+
+INPUT_FORMATS = {".parquet": "parquet", ".csv": "csv"}
+
+# Model state of the current process, loaded once by _init_worker
+_state = {}
+
+def _init_worker(model_path, preprocessor_path, imputer_path):
+    """Loads the artifacts once per process (and prefers the compiled preprocessor like the API)."""
+    # The compiled path feeds the model plain arrays; sklearn would warn once per chunk
+    warnings.filterwarnings("ignore", message="X does not have valid feature names")
+    model = joblib.load(model_path)
+    preprocessor = joblib.load(preprocessor_path)
+    fill_values = None
+    if imputer_path is not None and Path(imputer_path).exists():
+        with open(imputer_path) as f:
+            fill_values = json.load(f)["fill_values"]
+
+    compiled = None
+    try:
+        candidate = CompiledPreprocessor.from_sklearn(preprocessor)
+        if candidate.verify(preprocessor):
+            compiled = candidate
+            if fill_values is not None:
+                compiled.set_fill_values(fill_values)
+    except Exception:
+        compiled = None
+
+    columns = compiled.input_columns if compiled is not None else list(preprocessor.feature_names_in_)
+    _state.update(
+        model=model, preprocessor=preprocessor, compiled=compiled, columns=columns,
+        fill_values=np.array([fill_values.get(col, np.nan) for col in columns]) if fill_values else None,
+        positive_idx=list(model.classes_).index(1)
+    )
+
+def _score_chunk(raw, threshold):
+    """Positive-class probability and label per row; rows that cannot be imputed get NaN / <NA>."""
+    if _state["fill_values"] is not None:
+        raw = np.where(np.isnan(raw), _state["fill_values"], raw)
+    complete = ~np.isnan(raw).any(axis=1)
+
+    probability = np.full(len(raw), np.nan)
+    if complete.any():
+        rows = raw[complete]
+        if _state["compiled"] is not None:
+            features = _state["compiled"].transform(rows)
+        else:
+            features = _state["preprocessor"].transform(pd.DataFrame(rows, columns=_state["columns"]))
+        probability[complete] = _state["model"].predict_proba(features)[:, _state["positive_idx"]]
+
+    prediction = pd.array(np.where(complete, probability > threshold, 0).astype(np.int64), dtype="Int64")
+    prediction[~complete] = pd.NA
+    return probability, prediction
+
+def iter_input(path, chunksize, columns=None):
+    """Yields a CSV or Parquet file as DataFrames of at most chunksize rows."""
+    path = Path(path)
+    fmt = INPUT_FORMATS.get(path.suffix)
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    elif fmt == "csv":
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunksize)
+    else:
+        raise ValueError(f"Unsupported input format: {path.suffix} (use {', '.join(INPUT_FORMATS)})")
+
+class BatchScorer:
+    """
+    Offline scoring of large CSV/Parquet files with the exported best model.
+    The input is streamed in chunks that are scored by a process pool (each
+    worker loads the artifacts once); results are written in input order as
+    they complete. At most max_pending chunks are in flight, so memory stays
+    bounded whatever the input size.
+    """
+    def __init__(self, n_jobs=None, chunksize=None, threshold=None, max_pending=None):
+        self.project_root = Path(__file__).resolve().parent.parent
+        self.model_path = self.project_root / "models" / "best_model.pkl"
+        self.preprocessor_path = self.project_root / "models" / "preprocessor.pkl"
+        self.imputer_path = self.project_root / "models" / "imputer.json"
+
+        self.n_jobs = n_jobs or int(os.getenv("SCORING_N_JOBS", "0")) or os.cpu_count() or 1
+        self.chunksize = chunksize or int(os.getenv("SCORING_CHUNKSIZE", "50000"))
+        # Same default cut-off as the API
+        self.threshold = threshold if threshold is not None else float(os.getenv("DECISION_THRESHOLD", "0.5"))
+        self.max_pending = max_pending or 2 * self.n_jobs
+
+    def _artifacts(self):
+        return str(self.model_path), str(self.preprocessor_path), str(self.imputer_path)
+
+    def score(self, input_path, output_path, keep_columns=()):
+        """Writes keep_columns plus probability and prediction for every input row; returns the row count."""
+        try:
+            output_path = Path(output_path)
+            fmt = INPUT_FORMATS.get(output_path.suffix)
+            if fmt is None:
+                raise ValueError(f"Unsupported output format: {output_path.suffix} (use {', '.join(INPUT_FORMATS)})")
+
+            logger.info(f"Scoring {input_path} in chunks of {self.chunksize} rows with {self.n_jobs} processes")
+            _init_worker(*self._artifacts())
+            columns = _state["columns"]
+            keep_columns = list(keep_columns)
+            read_columns = columns + [col for col in keep_columns if col not in columns]
+
+            start = time.perf_counter()
+            with TableWriter(output_path, fmt=fmt, export_csv=False) as writer:
+                # A single process scores inline: no pickling of chunks to workers
+                pool = ProcessPoolExecutor(self.n_jobs, initializer=_init_worker, initargs=self._artifacts()) if self.n_jobs > 1 else None
+                try:
+                    pending = deque()
+                    for chunk in iter_input(input_path, self.chunksize, read_columns):
+                        raw = chunk[columns].to_numpy(dtype=np.float64)
+                        result = pool.submit(_score_chunk, raw, self.threshold) if pool else _score_chunk(raw, self.threshold)
+                        pending.append((chunk[keep_columns].reset_index(drop=True), result))
+
+                        # Write the oldest chunk once max_pending are in flight; keeps input order
+                        while len(pending) >= self.max_pending or (pool is None and pending):
+                            self._write(writer, *pending.popleft(), start)
+                    while pending:
+                        self._write(writer, *pending.popleft(), start)
+                finally:
+                    if pool is not None:
+                        pool.shutdown(cancel_futures=True)
+
+            seconds = time.perf_counter() - start
+            logger.info(f"Scored {writer.rows} rows in {seconds:.2f}s ({writer.rows / max(seconds, 1e-9):,.0f} rows/s) to {output_path}")
+            return writer.rows
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def _write(self, writer, kept, result, start):
+        probability, prediction = result.result() if isinstance(result, Future) else result
+        kept["probability"] = probability
+        kept["prediction"] = prediction
+        writer.write(kept)
+        seconds = time.perf_counter() - start
+        logger.info(f"{writer.rows} rows scored ({writer.rows / max(seconds, 1e-9):,.0f} rows/s)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score a CSV/Parquet file of patients with models/best_model.pkl.")
+    parser.add_argument("input", help="input .csv or .parquet with the 13 feature columns")
+    parser.add_argument("output", help="output .csv or .parquet")
+    parser.add_argument("--n-jobs", type=int, help="worker processes (default SCORING_N_JOBS or all CPUs)")
+    parser.add_argument("--chunksize", type=int, help="rows per chunk (default SCORING_CHUNKSIZE or 50000)")
+    parser.add_argument("--threshold", type=float, help="decision threshold (default DECISION_THRESHOLD or 0.5)")
+    parser.add_argument("--keep-columns", default="", help="comma-separated input columns to copy to the output, e.g. an ID")
+    args = parser.parse_args()
+
+    scorer = BatchScorer(n_jobs=args.n_jobs, chunksize=args.chunksize, threshold=args.threshold)
+    scorer.score(args.input, args.output, [col for col in args.keep_columns.split(",") if col])
@@ -0,0 +1,152 @@
+import os
+import hashlib
+import shutil
+import joblib
+import sklearn
+from pathlib import Path
+from src.logger import logger
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+class StageCache:
+    """
+    Content-addressed on-disk cache for pipeline stages. Keys are hashes of
+    the inputs (file contents, data, parameters, library version), values are
+    joblib files. The least recently used entries are evicted once the cache
+    grows past max_mb.
+    """
+    def __init__(self, cache_dir=None, max_mb=None, enabled=None):
+        self.cache_dir = Path(cache_dir or os.getenv("PIPELINE_CACHE_DIR", PROJECT_ROOT / ".cache" / "pipeline"))
+        self.max_bytes = int(float(max_mb if max_mb is not None else os.getenv("PIPELINE_CACHE_MAX_MB", "1024")) * 1024 * 1024)
+        self.enabled = enabled if enabled is not None else os.getenv("PIPELINE_CACHE", "1") == "1"
+
+    @staticmethod
+    def hash_file(path) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def key(self, *parts) -> str:
+        """Hashes the given parts; Path objects are hashed by file content."""
+        normalized = [self.hash_file(p) if isinstance(p, Path) else p for p in parts]
+        return joblib.hash((sklearn.__version__, normalized))
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.joblib"
+
+    def get(self, key: str):
+        """Returns the cached value or None on a miss."""
+        if not self.enabled:
+            return None
+
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            value = joblib.load(path)
+        except Exception:
+            # Corrupt or incompatible entry: drop it and recompute
+            path.unlink(missing_ok=True)
+            return None
+
+        # Mark as recently used for LRU eviction
+        os.utime(path)
+        return value
+
+    def set(self, key: str, value):
+        if not self.enabled:
+            return
+
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so concurrent readers (e.g. worker processes) never see partial files
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        joblib.dump(value, tmp_path)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for path in self.cache_dir.rglob("*.joblib"):
+            try:
+                stat = path.stat()
+                entries.append((stat.st_mtime, stat.st_size, path))
+            except FileNotFoundError:
+                continue
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            logger.info(f"Evicted cache entry {path.name} ({size / 1024:.1f} KB)")
+
+class ArtifactCache:
+    """
+    Local cache of downloaded MLflow run artifacts. Logged artifacts do not
+    change after a run finishes, so entries are addressed by a hash of the
+    tracking URI, run ID and artifact path and never go stale. Whole entries
+    are evicted least recently used first once the cache grows past max_mb.
+    """
+    def __init__(self, cache_dir=None, max_mb=None, enabled=None):
+        self.cache_dir = Path(cache_dir or os.getenv("ARTIFACT_CACHE_DIR", PROJECT_ROOT / ".cache" / "artifacts"))
+        self.max_bytes = int(float(max_mb if max_mb is not None else os.getenv("ARTIFACT_CACHE_MAX_MB", "2048")) * 1024 * 1024)
+        self.enabled = enabled if enabled is not None else os.getenv("ARTIFACT_CACHE", "1") == "1"
+
+    def _path(self, run_id: str, artifact_path: str) -> Path:
+        # mlflow is imported lazily: the other pipeline stages use this module without it
+        import mlflow
+        key = hashlib.sha256(f"{mlflow.get_tracking_uri()}|{run_id}|{artifact_path}".encode()).hexdigest()
+        return self.cache_dir / key
+
+    def download(self, run_id: str, artifact_path: str) -> Path:
+        """Returns a local directory with the artifacts, downloading them only on a miss."""
+        import mlflow
+        if not self.enabled:
+            return Path(mlflow.artifacts.download_artifacts(run_id=run_id, artifact_path=artifact_path))
+
+        entry = self._path(run_id, artifact_path)
+        if entry.exists():
+            logger.info(f"Artifact cache hit for run {run_id}/{artifact_path}")
+            # Mark as recently used for LRU eviction
+            os.utime(entry)
+            return entry / artifact_path
+
+        # Download next to the entry then rename so an interrupted download is never used
+        tmp_dir = entry.with_suffix(f".{os.getpid()}.tmp")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+        try:
+            mlflow.artifacts.download_artifacts(run_id=run_id, artifact_path=artifact_path, dst_path=str(tmp_dir))
+            os.replace(tmp_dir, entry)
+        except OSError:
+            # Another process stored the same entry first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if not entry.exists():
+                raise
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        logger.info(f"Downloaded run {run_id}/{artifact_path} into the artifact cache")
+        self.evict(keep=entry)
+        return entry / artifact_path
+
+    def evict(self, keep=None):
+        entries = []
+        for entry in self.cache_dir.iterdir():
+            if not entry.is_dir() or entry.suffix == ".tmp":
+                continue
+            size = sum(f.stat().st_size for f in entry.rglob("*") if f.is_file())
+            entries.append((entry.stat().st_mtime, size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if entry == keep:
+                continue
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            logger.info(f"Evicted artifact cache entry {entry.name} ({size / 1024:.1f} KB)")
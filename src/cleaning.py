@@ -0,0 +1,78 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+from pathlib import Path
+from src.logger import logger
+
+class DataCleaner:
+    """
+    Vectorized cleaning shared by the batch pipeline and the API: binarizes
+    the target and fills missing values with per-column statistics fitted
+    once (median for numeric columns, mode otherwise). The fitted values are
+    saved as a small JSON artifact so serving can impute missing fields.
+    """
+    def __init__(self, fill_values=None, target_column="target"):
+        self.fill_values = dict(fill_values or {})
+        self.target_column = target_column
+
+    @staticmethod
+    def _median(observed: np.ndarray):
+        """Median of a 1-D array without NaN, partitioned in place (a single-pivot np.partition is much cheaper than np.median)."""
+        if observed.size == 0:
+            return np.nan
+        mid = observed.size // 2
+        observed.partition(mid)
+        if observed.size % 2:
+            return observed[mid]
+        return (observed[:mid].max() + observed[mid]) / 2
+
+    def fit(self, df: pd.DataFrame):
+        # Column by column on the underlying arrays: no 2-D copy of the frame
+        fill_values = {}
+        for col in df.columns.drop(self.target_column, errors="ignore"):
+            values = df[col]
+            if is_numeric_dtype(values):
+                observed = values.to_numpy(dtype=np.float64)
+                fill_values[col] = self._median(observed[~np.isnan(observed)])
+            else:
+                mode = values.mode()
+                fill_values[col] = mode.iloc[0] if not mode.empty else np.nan
+
+        # A column without any observed value has no statistic; it is left unimputed
+        empty = [col for col, value in fill_values.items() if pd.isna(value)]
+        if empty:
+            logger.warning(f"No observed values to impute {empty} from; these columns are not imputed")
+        self.fill_values = {col: value for col, value in fill_values.items() if col not in empty}
+        return self
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        # Shallow copy: only the columns that contain NaN (and the target) are
+        # rewritten, and replacing them leaves the caller's frame untouched
+        df = df.copy(deep=False)
+        for col, value in self.fill_values.items():
+            if col not in df.columns:
+                continue
+            missing = df[col].isna()
+            if missing.any():
+                df[col] = df[col].mask(missing, value)
+        if self.target_column in df.columns:
+            df[self.target_column] = (df[self.target_column] > 0).astype(int)
+        return df
+
+    def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        return self.fit(df).transform(df)
+
+    def save(self, path):
+        os.makedirs(Path(path).parent, exist_ok=True)
+        with open(path, "w") as f:
+            # NumPy scalars -> plain Python values for JSON
+            fill_values = {col: val.item() if hasattr(val, "item") else val for col, val in self.fill_values.items()}
+            # allow_nan=False: a bare NaN is not valid JSON for other readers of the imputer
+            json.dump({"fill_values": fill_values}, f, indent=2, allow_nan=False)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls(json.load(f)["fill_values"])
@@ -0,0 +1,171 @@
+import numpy as np
+
+
+class CompiledPreprocessor:
+    """
+    Pandas-free replacement for the fitted ColumnTransformer built by
+    DataTransformation.get_data_transformer_object. Scaler statistics and
+    one-hot categories are extracted once and applied with plain NumPy.
+    Optional fill values (aligned with input_columns) replace missing inputs.
+    """
+
+    def __init__(self, numerical_columns, categorical_columns, mean, scale, categories, num_slice, cat_offsets, n_features_out, fill_values=None):
+        self.numerical_columns = list(numerical_columns)
+        self.categorical_columns = list(categorical_columns)
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.categories = [np.asarray(cats, dtype=np.float64) for cats in categories]
+        self.num_slice = num_slice
+        self.cat_offsets = list(cat_offsets)
+        self.n_features_out = int(n_features_out)
+        self.input_columns = self.numerical_columns + self.categorical_columns
+        self.fill_values = None if fill_values is None else np.asarray(fill_values, dtype=np.float64)
+
+    def set_fill_values(self, fill_values):
+        """Aligns a column -> fill value mapping (e.g. models/imputer.json) with the input columns."""
+        self.fill_values = np.array([fill_values[col] for col in self.input_columns], dtype=np.float64)
+
+    @classmethod
+    def from_sklearn(cls, preprocessor):
+        """Extracts the learned state of a fitted ColumnTransformer."""
+        from sklearn.preprocessing import StandardScaler, OneHotEncoder
+
+        numerical_columns, categorical_columns = [], []
+        mean = scale = np.zeros(0)
+        num_slice = slice(0, 0)
+        categories, cat_offsets = [], []
+
+        # 1. Walk the fitted transformers and pull out their learned state
+        for name, transformer, columns in preprocessor.transformers_:
+            if name == "remainder":
+                if transformer != "drop":
+                    raise ValueError("Only remainder='drop' is supported.")
+                continue
+
+            output_slice = preprocessor.output_indices_[name]
+
+            if isinstance(transformer, StandardScaler) and not numerical_columns:
+                numerical_columns = list(columns)
+                num_slice = output_slice
+                n_cols = len(columns)
+                mean = transformer.mean_ if transformer.with_mean else np.zeros(n_cols)
+                scale = transformer.scale_ if transformer.with_std else np.ones(n_cols)
+
+            elif isinstance(transformer, OneHotEncoder) and not categorical_columns:
+                if transformer.drop is not None or getattr(transformer, "_infrequent_enabled", False):
+                    raise ValueError("OneHotEncoder with drop or infrequent categories is not supported.")
+                if transformer.handle_unknown != "ignore":
+                    raise ValueError("Only handle_unknown='ignore' is supported.")
+
+                categorical_columns = list(columns)
+                offset = output_slice.start
+                for cats in transformer.categories_:
+                    cats = np.asarray(cats, dtype=np.float64)
+                    if np.isnan(cats).any():
+                        raise ValueError("NaN categories are not supported.")
+                    categories.append(cats)
+                    cat_offsets.append(offset)
+                    offset += len(cats)
+            else:
+                raise ValueError(f"Unsupported transformer '{name}': {type(transformer).__name__}")
+
+        n_features_out = sum(s.stop - s.start for s in preprocessor.output_indices_.values())
+        return cls(numerical_columns, categorical_columns, mean, scale, categories, num_slice, cat_offsets, n_features_out)
+
+    def to_arrays(self):
+        """Flat array representation, suitable for np.savez without pickling."""
+        arrays = {
+            "numerical_columns": np.array(self.numerical_columns, dtype=str),
+            "categorical_columns": np.array(self.categorical_columns, dtype=str),
+            "num_mean": self.mean,
+            "num_scale": self.scale,
+            "num_slice": np.array([self.num_slice.start, self.num_slice.stop]),
+            "cat_values": np.concatenate(self.categories) if self.categories else np.zeros(0),
+            "cat_lengths": np.array([len(cats) for cats in self.categories], dtype=np.int64),
+            "cat_offsets": np.array(self.cat_offsets, dtype=np.int64),
+            "n_features_out": np.array(self.n_features_out),
+        }
+        if self.fill_values is not None:
+            arrays["fill_values"] = self.fill_values
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        bounds = np.cumsum(arrays["cat_lengths"])[:-1]
+        start, stop = (int(v) for v in arrays["num_slice"])
+        return cls(
+            [str(c) for c in arrays["numerical_columns"]],
+            [str(c) for c in arrays["categorical_columns"]],
+            arrays["num_mean"],
+            arrays["num_scale"],
+            np.split(arrays["cat_values"], bounds) if len(arrays["cat_lengths"]) else [],
+            slice(start, stop),
+            [int(v) for v in arrays["cat_offsets"]],
+            arrays["n_features_out"],
+            arrays["fill_values"] if "fill_values" in arrays else None
+        )
+
+    def to_array(self, records):
+        """Converts a list of dict records into the raw float64 input matrix; absent or None fields become NaN."""
+        return np.array(
+            [[record.get(col) for col in self.input_columns] for record in records],
+            dtype=np.float64
+        ).reshape(len(records), len(self.input_columns))
+
+    def transform(self, raw):
+        """Scales and one-hot encodes a raw input matrix into a preallocated output."""
+        n_rows = raw.shape[0]
+        n_num = len(self.numerical_columns)
+        out = np.zeros((n_rows, self.n_features_out), dtype=np.float64)
+
+        # 0. Impute missing inputs with the fitted fill values
+        if self.fill_values is not None:
+            missing = np.isnan(raw)
+            if missing.any():
+                raw = np.where(missing, self.fill_values, raw)
+
+        # 1. Standard scaling, same operation order as StandardScaler.transform
+        if n_num:
+            scaled = out[:, self.num_slice]
+            np.subtract(raw[:, :n_num], self.mean, out=scaled)
+            np.divide(scaled, self.scale, out=scaled)
+
+        # 2. One-hot encoding; unknown values leave the row block at zero
+        rows = np.arange(n_rows)
+        for j, (cats, offset) in enumerate(zip(self.categories, self.cat_offsets)):
+            values = raw[:, n_num + j]
+            pos = np.searchsorted(cats, values)
+            pos_clipped = np.minimum(pos, len(cats) - 1)
+            known = cats[pos_clipped] == values
+            out[rows[known], offset + pos_clipped[known]] = 1.0
+
+        return out
+
+    def transform_records(self, records):
+        return self.transform(self.to_array(records))
+
+    def probe_records(self):
+        """Builds inputs covering every category, an unknown value and varied numerics."""
+        n_rows = max([len(cats) for cats in self.categories] + [1]) + 1
+        records = []
+        for i in range(n_rows):
+            record = {}
+            for k, col in enumerate(self.numerical_columns):
+                record[col] = float(self.mean[k] + (i - n_rows / 2) * self.scale[k] * 0.37)
+            for cats, col in zip(self.categories, self.categorical_columns):
+                # Last row uses a value outside the fitted categories
+                record[col] = float(cats[i % len(cats)]) if i < n_rows - 1 else float(cats.max() + 1)
+            records.append(record)
+        return records
+
+    def verify(self, preprocessor):
+        """Returns True when the compiled path matches preprocessor.transform bit for bit."""
+        import pandas as pd
+
+        records = self.probe_records()
+        expected = preprocessor.transform(pd.DataFrame(records, columns=list(preprocessor.feature_names_in_)))
+        if hasattr(expected, "toarray"):
+            expected = expected.toarray()
+
+        actual = self.transform_records(records)
+        return expected.shape == actual.shape and np.array_equal(expected, actual)
@@ -3,50 +3,69 @@ import sys
 import pandas as pd
 import numpy as np
 import requests
+from collections import Counter
 from io import StringIO
 from pathlib import Path
 from src.logger import logger
 from src.exception import CustomException
+from src.storage import table_path, write_table, TableWriter
+from src.cleaning import DataCleaner
+
+UCI_URL = "https://archive.ics.uci.edu/ml/machine-learning-databases/heart-disease/processed.cleveland.data"
 
 class DataIngestion:
-    def __init__(self):
+    def __init__(self, source=None, chunksize=None):
         self.raw_data_path = Path("data/raw/heart_raw.csv")
-        self.processed_data_path = Path("data/processed/heart_cleaned.csv")
-        
+        self.processed_data_path = table_path("data/processed/heart_cleaned")
+        # Downloaded copy of a remote source, read chunk by chunk in streaming mode
+        self.download_path = Path("data/raw/heart_source.data")
+        # Fitted fill values, saved next to preprocessor.pkl so the API can impute missing fields
+        self.imputer_path = Path("models/imputer.json")
+
+        # URL or local file in the UCI format (no header, '?' for missing values)
+        self.source = source or os.getenv("INGESTION_SOURCE", UCI_URL)
+        # Rows per chunk; 0 loads the whole dataset in memory at once
+        self.chunksize = chunksize if chunksize is not None else int(os.getenv("INGESTION_CHUNK_SIZE", "0"))
+
+        self.column_names = [
+            'age', 'sex', 'cp', 'trestbps', 'chol', 'fbs', 'restecg',
+            'thalach', 'exang', 'oldpeak', 'slope', 'ca', 'thal', 'target'
+        ]
+
+    def _is_remote(self):
+        return str(self.source).startswith(("http://", "https://"))
+
     def initiate_data_ingestion(self):
+        if self.chunksize > 0:
+            return self.initiate_streaming_ingestion()
+
         logger.info("Starting Data Ingestion component")
         try:
-            url = "https://archive.ics.uci.edu/ml/machine-learning-databases/heart-disease/processed.cleveland.data"
-            column_names = [
-                'age', 'sex', 'cp', 'trestbps', 'chol', 'fbs', 'restecg',
-                'thalach', 'exang', 'oldpeak', 'slope', 'ca', 'thal', 'target'
-            ]
+            column_names = self.column_names
 
             # Download data
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-            
-            df = pd.read_csv(StringIO(response.text), names=column_names, na_values='?')
-            logger.info("Dataset downloaded successfully from UCI repository")
+            if self._is_remote():
+                response = requests.get(self.source, timeout=30)
+                response.raise_for_status()
+                df = pd.read_csv(StringIO(response.text), names=column_names, na_values='?')
+                logger.info("Dataset downloaded successfully from UCI repository")
+            else:
+                df = pd.read_csv(self.source, names=column_names, na_values='?')
+                logger.info(f"Dataset loaded from {self.source}")
 
             # Save Processed file
             os.makedirs(self.raw_data_path.parent, exist_ok=True)
             df.to_csv(self.raw_data_path, index=False)
             logger.info(f"Downloaded Raw data saved to {self.raw_data_path}")
 
-            # Basic Cleaning
-            df['target'] = df['target'].apply(lambda x: 1 if x > 0 else 0)
-            
-            # Handle Missing Values (Imputation)
-            for col in df.columns:
-                if df[col].isnull().any():
-                    val = df[col].median() if df[col].dtype != 'O' else df[col].mode()[0]
-                    df[col] = df[col].fillna(val)
-            
+            # Basic Cleaning: binarize the target and impute every feature column in one pass
+            cleaner = DataCleaner()
+            df = cleaner.fit_transform(df)
+            cleaner.save(self.imputer_path)
+            logger.info(f"Imputation values saved to {self.imputer_path}")
+
             # Save Processed file
-            os.makedirs(self.processed_data_path.parent, exist_ok=True)
-            
-            df.to_csv(self.processed_data_path, index=False)
+            write_table(df, self.processed_data_path)
             logger.info(f"Processed data saved to {self.processed_data_path}")
 
             return self.processed_data_path
@@ -54,6 +73,92 @@ class DataIngestion:
         except Exception as e:
             raise CustomException(e, sys)
 
+    def _download_source(self):
+        """Streams a remote source to disk so it never has to fit in memory."""
+        if not self._is_remote():
+            return Path(self.source)
+
+        os.makedirs(self.download_path.parent, exist_ok=True)
+        with requests.get(self.source, timeout=30, stream=True) as response:
+            response.raise_for_status()
+            with open(self.download_path, "wb") as f:
+                for block in response.iter_content(chunk_size=1 << 20):
+                    f.write(block)
+        logger.info(f"Dataset streamed from {self.source} to {self.download_path}")
+        return self.download_path
+
+    def _read_chunks(self, path, dtype=None):
+        return pd.read_csv(
+            path, names=self.column_names, na_values='?',
+            dtype=dtype, chunksize=self.chunksize
+        )
+
+    @staticmethod
+    def _median_from_counts(counts: Counter):
+        """Exact median (pandas semantics) from a value -> count table; None when nothing was observed."""
+        total = sum(counts.values())
+        if total == 0:
+            return None
+
+        # 0-based positions of the middle element(s)
+        lo, hi = (total - 1) // 2, total // 2
+        seen, lo_val = 0, None
+        for value in sorted(counts):
+            seen += counts[value]
+            if lo_val is None and seen > lo:
+                lo_val = value
+            if seen > hi:
+                return (lo_val + value) / 2
+
+    def initiate_streaming_ingestion(self):
+        """
+        Two-pass, bounded-memory ingestion. Pass 1 copies the raw data and
+        gathers per-column value counts (exact medians with memory bounded by
+        the number of distinct values, not rows) and the column dtypes a single
+        read of the whole file would infer. Pass 2 reads every chunk with those
+        dtypes, binarizes the target, imputes and appends it to the processed
+        table, so both modes write the same schema.
+        """
+        logger.info(f"Starting streaming Data Ingestion with chunks of {self.chunksize} rows")
+        try:
+            source_path = self._download_source()
+            feature_cols = [c for c in self.column_names if c != 'target']
+
+            # Pass 1: raw copy + statistics for imputation + dtypes
+            counts = {col: Counter() for col in feature_cols}
+            dtypes = {}
+            n_rows = 0
+
+            os.makedirs(self.raw_data_path.parent, exist_ok=True)
+            for i, chunk in enumerate(self._read_chunks(source_path)):
+                chunk.to_csv(self.raw_data_path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+                n_rows += len(chunk)
+                # A column is integer for the whole file only if it is in every chunk
+                for col, dtype in chunk.dtypes.items():
+                    dtypes[col] = np.result_type(dtypes.get(col, dtype), dtype)
+                for col in feature_cols:
+                    counts[col].update(chunk[col].dropna().value_counts().to_dict())
+            logger.info(f"Raw data ({n_rows} rows) saved to {self.raw_data_path}")
+
+            medians = {col: self._median_from_counts(counts[col]) for col in feature_cols}
+            empty = [col for col, median in medians.items() if median is None]
+            if empty:
+                logger.warning(f"No observed values to impute {empty} from; these columns are not imputed")
+            cleaner = DataCleaner({col: median for col, median in medians.items() if median is not None})
+            cleaner.save(self.imputer_path)
+            logger.info(f"Imputation values saved to {self.imputer_path}: {cleaner.fill_values}")
+
+            # Pass 2: clean each chunk vectorially and append it to the output
+            with TableWriter(self.processed_data_path) as writer:
+                for chunk in self._read_chunks(source_path, dtypes):
+                    writer.write(cleaner.transform(chunk))
+
+            logger.info(f"Processed data saved to {self.processed_data_path}")
+            return self.processed_data_path
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
 if __name__ == "__main__":
     obj = DataIngestion()
-    obj.initiate_data_ingestion()
\ No newline at end of file
+    obj.initiate_data_ingestion()
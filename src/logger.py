@@ -3,7 +3,9 @@ import os
 import json
 import sys
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from src.async_logging import enable_queue_logging
 
 # Try to import ipynbname for general Jupyter support
 try:
@@ -11,23 +13,27 @@ try:
 except ImportError:
     ipynbname = None
 
+@lru_cache(maxsize=None)
+def notebook_origin():
+    """Name of the notebook this process runs in, or None. Resolved once per process."""
+    # 1. Check if running in VS Code Jupyter
+    # VS Code injects '__vsc_ipynb_file__' into the global scope
+    vsc_file = sys.modules['__main__'].__dict__.get('__vsc_ipynb_file__')
+
+    if vsc_file:
+        return Path(vsc_file).name
+    # 2. Check if running in standard Jupyter via ipynbname
+    if ipynbname:
+        try:
+            return ipynbname.name() + ".ipynb"
+        except:
+            pass
+    return None
+
 class JSONFormatter(logging.Formatter):
     def format(self, record):
-        file_origin = record.filename
-        
-        # 1. Check if running in VS Code Jupyter
-        # VS Code injects '__vsc_ipynb_file__' into the global scope
-        vsc_file = sys.modules['__main__'].__dict__.get('__vsc_ipynb_file__')
-        
-        if vsc_file:
-            file_origin = Path(vsc_file).name
-        # 2. Check if running in standard Jupyter via ipynbname
-        elif ipynbname:
-            try:
-                file_origin = ipynbname.name() + ".ipynb"
-            except:
-                pass
-        
+        file_origin = notebook_origin() or record.filename
+
         # 3. Clean up the "12345.py" temp names if still present
         if file_origin.endswith('.py') and file_origin[:-3].isdigit():
             file_origin = "Jupyter_Notebook_Unknown"
@@ -66,4 +72,9 @@ if not logger.handlers:
 
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(JSONFormatter())
-    logger.addHandler(console_handler)
\ No newline at end of file
+    logger.addHandler(console_handler)
+
+    # Write records from a background thread instead of the caller. Off by default because
+    # records logged from forked worker processes (e.g. parallel searches) would be lost.
+    if os.getenv("LOG_ASYNC", "0") == "1":
+        enable_queue_logging(logger)
\ No newline at end of file
@@ -6,14 +6,76 @@ import mlflow
 from mlflow.tracking import MlflowClient
 from src.logger import logger
 from src.exception import CustomException
+from src.cache import ArtifactCache, StageCache
 
 class ModelEvaluator:
-    def __init__(self):
+    def __init__(self, run_scope=None, artifact_cache=None):
         self.experiment_name = "Heart_Disease_Classification"
         # We select the best model based on Recall to minimize False Negatives
         self.target_metric = "metrics.recall" 
         self.project_root = Path(__file__).resolve().parent.parent
         self.destination_path = self.project_root / "models" / "best_model.pkl"
+        self.registered_model_name = "HeartDiseaseClassifier"
+        # "batch" compares only the runs of the latest ModelTrainer invocation, "all" every run
+        self.run_scope = run_scope or os.getenv("EVAL_RUN_SCOPE", "batch")
+        # Reuses downloaded model artifacts across evaluations
+        self.artifact_cache = artifact_cache or ArtifactCache()
+
+        if self.run_scope not in ("batch", "all"):
+            raise ValueError(f"Unknown run scope: {self.run_scope}")
+
+    def find_best_run(self, client, experiment_id):
+        """Best finished run by recall, within the latest training batch unless run_scope is "all"."""
+        filter_string = "attributes.status = 'FINISHED'"
+        if self.run_scope == "batch":
+            latest = client.search_runs(
+                experiment_ids=[experiment_id],
+                filter_string=filter_string,
+                order_by=["attributes.start_time DESC"],
+                max_results=1
+            )
+            training_batch = latest[0].data.tags.get("training_batch") if latest else None
+            if training_batch:
+                logger.info(f"Comparing runs of training batch {training_batch}")
+                filter_string += f" and tags.training_batch = '{training_batch}'"
+            else:
+                # Runs logged before batches were tagged
+                logger.info("Latest run has no training_batch tag; comparing all runs")
+
+        runs = client.search_runs(
+            experiment_ids=[experiment_id],
+            filter_string=filter_string,
+            order_by=[f"{self.target_metric} DESC"],
+            max_results=1
+        )
+        return runs[0] if runs else None
+
+    def staged_version(self, client, run_id):
+        """The registered version of this run, preferring one already in Staging."""
+        versions = client.search_model_versions(f"name='{self.registered_model_name}' and run_id='{run_id}'")
+        versions = sorted(versions, key=lambda v: (v.current_stage == "Staging", int(v.version)), reverse=True)
+        return versions[0] if versions else None
+
+    def export_model(self, run_id, version=None):
+        """Copies the run's model.pkl to models/, unless the file there already is that model."""
+        expected_hash = version.tags.get("model_sha256") if version else None
+        if expected_hash and self.destination_path.exists() and StageCache.hash_file(self.destination_path) == expected_hash:
+            logger.info(f"{self.destination_path.name} already holds the model of run {run_id}; skipping export")
+            return expected_hash
+
+        logger.info(f"Exporting the best model to {self.destination_path}")
+        local_path = self.artifact_cache.download(run_id, "model")
+
+        # Scikit-learn models logged in MLflow contain a 'model.pkl' inside the 'model' folder
+        source_pkl = Path(local_path) / "model.pkl"
+
+        # Copy to our project's models folder; replace atomically so a running
+        # API watching models/ never reads a half-written file
+        tmp_path = self.destination_path.with_suffix(".pkl.tmp")
+        shutil.copy(source_pkl, tmp_path)
+        os.replace(tmp_path, self.destination_path)
+        logger.info("Successfully exported best_model.pkl")
+        return StageCache.hash_file(self.destination_path)
 
     def evaluate_and_register(self):
         try:
@@ -26,17 +88,12 @@ class ModelEvaluator:
             if not experiment:
                 raise Exception(f"Experiment {self.experiment_name} not found!")
 
-            # 2. Search for the best run in the current experiment based on Recall
-            runs = client.search_runs(
-                experiment_ids=[experiment.experiment_id],
-                order_by=[f"{self.target_metric} DESC"],
-                max_results=1
-            )
+            # 2. Search for the best run of the latest training batch based on Recall
+            best_run = self.find_best_run(client, experiment.experiment_id)
 
-            if not runs:
+            if best_run is None:
                 raise Exception("No runs found in the experiment.")
 
-            best_run = runs[0]
             best_run_id = best_run.info.run_id
             best_model_name = best_run.data.tags.get("mlflow.runName", "Unknown_Model")
             best_metric_value = best_run.data.metrics.get("recall")
@@ -44,32 +101,30 @@ class ModelEvaluator:
             logger.info(f"Winner Model: {best_model_name} with Recall: {best_metric_value:.4f}")
 
             # 3. Export the Winning Model to .pkl for Flask/Docker use
-            logger.info(f"Exporting the best model to {self.destination_path}")
-            
-            # Download model artifacts to a temporary directory
-            local_path = mlflow.artifacts.download_artifacts(run_id=best_run_id, artifact_path="model")
-            
-            # Scikit-learn models logged in MLflow contain a 'model.pkl' inside the 'model' folder
-            source_pkl = Path(local_path) / "model.pkl"
-            
-            # Copy to our project's models folder
-            shutil.copy(source_pkl, self.destination_path)
-            logger.info("Successfully exported best_model.pkl")
+            version = self.staged_version(client, best_run_id)
+            model_hash = self.export_model(best_run_id, version)
 
-            # 4. Register the model in the MLflow Model Registry
-            model_uri = f"runs:/{best_run_id}/model"
-            reg_name = "HeartDiseaseClassifier"
-            
-            result = mlflow.register_model(model_uri, reg_name)
-            logger.info(f"Successfully registered model version {result.version} to Registry.")
+            # 4. Register the model in the MLflow Model Registry, once per run
+            reg_name = self.registered_model_name
+            if version is None:
+                model_uri = f"runs:/{best_run_id}/model"
+                version = mlflow.register_model(model_uri, reg_name)
+                logger.info(f"Successfully registered model version {version.version} to Registry.")
+            if version.tags.get("model_sha256") != model_hash:
+                client.set_model_version_tag(reg_name, version.version, "model_sha256", model_hash)
+
+            if version.current_stage == "Staging":
+                logger.info(f"Run {best_run_id} is already version {version.version} in 'Staging'; skipping registration.")
+                return version
 
             # 5. Transition to "Staging"
-            client.transition_model_version_stage(
+            version = client.transition_model_version_stage(
                 name=reg_name,
-                version=result.version,
+                version=version.version,
                 stage="Staging"
             )
-            logger.info(f"Model version {result.version} promoted to 'Staging' stage.")
+            logger.info(f"Model version {version.version} promoted to 'Staging' stage.")
+            return version
 
         except Exception as e:
             raise CustomException(e, sys)
@@ -0,0 +1,65 @@
+import os
+import sys
+import json
+import shutil
+import joblib
+import numpy as np
+from pathlib import Path
+
+from src.array_model import ArrayModel
+from src.compiled_preprocessor import CompiledPreprocessor
+from src.logger import logger
+from src.exception import CustomException
+
+class ModelExporter:
+    def __init__(self):
+        self.project_root = Path(__file__).resolve().parent.parent
+        self.model_path = self.project_root / "models" / "best_model.pkl"
+        self.preprocessor_path = self.project_root / "models" / "preprocessor.pkl"
+        self.imputer_path = self.project_root / "models" / "imputer.json"
+        self.export_path = self.project_root / "models" / "best_model.npz"
+        # Uncompressed one-array-per-file layout that workers can memory-map
+        self.mmap_dir = self.project_root / "models" / "best_model_mmap"
+
+    def export(self):
+        """Compiles the preprocessor and best model into a single array-only .npz file."""
+        try:
+            logger.info("Starting array export of the best model")
+            model = joblib.load(self.model_path)
+            preprocessor = joblib.load(self.preprocessor_path)
+
+            # 1. Preprocessor: scaler statistics, one-hot categories and imputation values
+            compiled = CompiledPreprocessor.from_sklearn(preprocessor)
+            if not compiled.verify(preprocessor):
+                raise Exception("Compiled preprocessor does not match preprocessor.transform")
+            if self.imputer_path.exists():
+                with open(self.imputer_path) as f:
+                    compiled.set_fill_values(json.load(f)["fill_values"])
+
+            arrays = {f"pre_{key}": value for key, value in compiled.to_arrays().items()}
+
+            # 2. Model: coefficients or flattened tree node arrays
+            arrays.update(ArrayModel.model_to_arrays(model))
+            logger.info(f"Exporting {type(model).__name__} as {arrays['model_kind']}")
+
+            os.makedirs(self.export_path.parent, exist_ok=True)
+            np.savez_compressed(self.export_path, **arrays)
+
+            size_kb = self.export_path.stat().st_size / 1024
+            logger.info(f"Array export saved to {self.export_path} ({size_kb:.1f} KB)")
+
+            # 3. Same arrays as individual .npy files for np.load(mmap_mode='r')
+            if self.mmap_dir.exists():
+                shutil.rmtree(self.mmap_dir)
+            self.mmap_dir.mkdir(parents=True)
+            for key, value in arrays.items():
+                np.save(self.mmap_dir / f"{key}.npy", value, allow_pickle=False)
+            logger.info(f"Memory-mappable export saved to {self.mmap_dir}")
+            return self.export_path
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+if __name__ == "__main__":
+    exporter = ModelExporter()
+    exporter.export()
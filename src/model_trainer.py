@@ -1,27 +1,195 @@
 import os
 import sys
+import time
+import uuid
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from pathlib import Path
 
 import mlflow
-import mlflow.sklearn
 from sklearn.linear_model import LogisticRegression
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import GridSearchCV, train_test_split
-from sklearn.metrics import accuracy_score, precision_score, recall_score, roc_auc_score, confusion_matrix, ConfusionMatrixDisplay
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import GridSearchCV, RandomizedSearchCV, HalvingGridSearchCV, ParameterGrid, ParameterSampler, train_test_split
+from sklearn.base import clone
+import joblib
+from scipy.stats import loguniform, randint, rankdata
+from sklearn.metrics import check_scoring, accuracy_score, precision_score, recall_score, roc_auc_score, confusion_matrix, ConfusionMatrixDisplay
+
+from concurrent.futures import ProcessPoolExecutor
 
 from src.logger import logger
 from src.exception import CustomException
+from src.storage import SPARSE, table_path, read_table, sparse_path, read_sparse
+from src.cache import StageCache
+from src.tracking import BatchedRunLogger
+
+def _fit_search(search, X_train, y_train, cache=None):
+    """Fits one hyperparameter search; module level so it can run in a worker process."""
+    start = time.perf_counter()
+    if cache is not None and cache.enabled and _is_deterministic(search.estimator):
+        search = _fit_search_cached(search, X_train, y_train, cache)
+    else:
+        search.fit(X_train, y_train)
+    return search, time.perf_counter() - start
+
+def _is_deterministic(estimator):
+    """Scores of an estimator with an unseeded random_state are not a function of the cache key."""
+    if estimator.get_params().get("random_state", 0) is None:
+        logger.info(f"{type(estimator).__name__} has no random_state; not caching its search")
+        return False
+    return True
+
+def _fit_search_cached(search, X_train, y_train, cache):
+    """
+    Fits a search reusing cached work. Grid and randomized searches cache
+    the fold scores of every candidate, so only new grid points are
+    cross-validated; successive halving is adaptive and is cached whole.
+    Keys cover this module's code, the training data, the estimator, the
+    CV setup and scoring.
+    """
+    estimator = search.estimator
+    common = (
+        cache.hash_file(Path(__file__)), joblib.hash((X_train, y_train)),
+        type(estimator).__name__, estimator.get_params(), search.cv, search.scoring
+    )
+
+    if not isinstance(search, (GridSearchCV, RandomizedSearchCV)):
+        key = cache.key("search", common, search.get_params())
+        cached = cache.get(key)
+        if cached is not None:
+            logger.info(f"Reusing cached {type(search).__name__} for {type(estimator).__name__}")
+            return cached
+        search.fit(X_train, y_train)
+        cache.set(key, search)
+        return search
+
+    if isinstance(search, GridSearchCV):
+        candidates = list(ParameterGrid(search.param_grid))
+    else:
+        candidates = list(ParameterSampler(search.param_distributions, search.n_iter, random_state=search.random_state))
+
+    keys = [cache.key("cv_scores", common, candidate) for candidate in candidates]
+    results = [cache.get(key) for key in keys]
+    missing = [i for i, result in enumerate(results) if result is None]
+    logger.info(f"{type(estimator).__name__}: {len(candidates) - len(missing)} of {len(candidates)} candidates reused from cache")
+
+    # Cross-validate only the candidates without cached scores
+    if missing:
+        sub_search = GridSearchCV(
+            clone(estimator), [{k: [v] for k, v in candidates[i].items()} for i in missing],
+            cv=search.cv, scoring=search.scoring, n_jobs=search.n_jobs, refit=False
+        )
+        sub_search.fit(X_train, y_train)
+        timing_keys = ("mean_fit_time", "std_fit_time", "mean_score_time", "std_score_time")
+        for j, i in enumerate(missing):
+            results[i] = {
+                "test_scores": [float(sub_search.cv_results_[f"split{f}_test_score"][j]) for f in range(sub_search.n_splits_)],
+                **{key: float(sub_search.cv_results_[key][j]) for key in timing_keys},
+            }
+            cache.set(keys[i], results[i])
+
+    # Same selection rule as GridSearchCV: highest mean score, first candidate on ties
+    cv_results = _cv_results(candidates, results)
+    means = cv_results["mean_test_score"]
+    best_index = int(np.argmax(np.where(np.isnan(means), -np.inf, means)))
+    best_params = candidates[best_index]
+
+    refit_key = cache.key("refit", common, best_params)
+    refit = cache.get(refit_key)
+    if refit is None:
+        refit_start = time.perf_counter()
+        best_estimator = clone(estimator).set_params(**best_params).fit(X_train, y_train)
+        refit = (best_estimator, time.perf_counter() - refit_start)
+        cache.set(refit_key, refit)
+
+    # Populate the attributes a fitted (single-metric) search exposes
+    search.cv_results_ = cv_results
+    search.n_splits_ = len(results[best_index]["test_scores"])
+    search.multimetric_ = False
+    search.scorer_ = check_scoring(estimator, scoring=search.scoring)
+    search.best_index_ = best_index
+    search.best_params_ = best_params
+    search.best_score_ = float(means[best_index])
+    search.best_estimator_, search.refit_time_ = refit
+    if hasattr(search.best_estimator_, "feature_names_in_"):
+        search.feature_names_in_ = search.best_estimator_.feature_names_in_
+    return search
+
+def _cv_results(candidates, results):
+    """Rebuilds GridSearchCV.cv_results_ (test scores, timings, params) from cached per-candidate results."""
+    test_scores = np.array([result["test_scores"] for result in results])
+    cv_results = {
+        key: np.array([result[key] for result in results])
+        for key in ("mean_fit_time", "std_fit_time", "mean_score_time", "std_score_time")
+    }
+
+    # Parameter columns are masked where a candidate does not set that parameter
+    for name in sorted({name for candidate in candidates for name in candidate}):
+        column = np.ma.MaskedArray(np.empty(len(candidates), dtype=object), mask=True)
+        for i, candidate in enumerate(candidates):
+            if name in candidate:
+                column[i] = candidate[name]
+        cv_results[f"param_{name}"] = column
+    cv_results["params"] = candidates
+
+    for fold in range(test_scores.shape[1]):
+        cv_results[f"split{fold}_test_score"] = test_scores[:, fold]
+    means = test_scores.mean(axis=1)
+    cv_results["mean_test_score"] = means
+    cv_results["std_test_score"] = test_scores.std(axis=1)
+    # Ranked like GridSearchCV: ties share the lowest rank, failed (NaN) candidates come last
+    if np.isnan(means).all():
+        cv_results["rank_test_score"] = np.ones(len(means), dtype=np.int32)
+    else:
+        ranked = np.nan_to_num(means, nan=np.nanmin(means) - 1)
+        cv_results["rank_test_score"] = rankdata(-ranked, method="min").astype(np.int32)
+    return cv_results
+
+def _log_confusion_matrix(client, run_id, y_true, y_pred, path):
+    """Renders without pyplot (not thread-safe) so it can run on the artifact thread."""
+    fig = Figure(figsize=(6, 6))
+    ConfusionMatrixDisplay.from_predictions(y_true, y_pred, ax=fig.subplots())
+    fig.savefig(path)
+    client.log_artifact(run_id, str(path))
 
 class ModelTrainer:
-    def __init__(self):
+    def __init__(self, n_jobs=None, parallel_families=None, search_strategy=None, sparse=None, log_plots=None, async_artifacts=None):
         self.project_root = Path(__file__).resolve().parent.parent
-        self.data_path = self.project_root / "data" / "processed" / "heart_transformed.csv"
+        # Sparse mode trains on the CSR artifact written by DataTransformation(sparse=True)
+        self.sparse = sparse if sparse is not None else SPARSE
+        transformed = self.project_root / "data" / "processed" / "heart_transformed"
+        self.data_path = sparse_path(transformed) if self.sparse else table_path(transformed)
         self.model_dir = self.project_root / "models"
         self.model_dir.mkdir(parents=True, exist_ok=True)
 
+        # Worker processes for grid points x folds (1 = serial, -1 = all cores)
+        self.n_jobs = n_jobs if n_jobs is not None else int(os.getenv("TRAINER_N_JOBS", "1"))
+        # Fit the model families concurrently, each in its own process
+        self.parallel_families = (
+            parallel_families if parallel_families is not None
+            else os.getenv("TRAINER_PARALLEL_FAMILIES", "0") == "1"
+        )
+
+        # Search strategy: "grid" (exhaustive), "random" or "halving" (successive halving)
+        self.search_strategy = search_strategy or os.getenv("TRAINER_SEARCH_STRATEGY", "grid")
+        # Candidates sampled per family by the randomized search
+        self.search_n_iter = int(os.getenv("TRAINER_SEARCH_N_ITER", "20"))
+        # Fraction of candidates kept (1 / factor) after each successive-halving round
+        self.halving_factor = int(os.getenv("TRAINER_HALVING_FACTOR", "3"))
+
+        # Reuse cross-validation scores and refits across runs
+        self.cache = StageCache()
+
+        # Confusion-matrix plots (needed by the DVC train stage outs); skip for fast ad hoc runs
+        self.log_plots = log_plots if log_plots is not None else os.getenv("TRAINER_LOG_PLOTS", "1") == "1"
+        # Render and upload plots and models on a background thread while the next family is logged
+        self.async_artifacts = async_artifacts if async_artifacts is not None else os.getenv("TRAINER_ASYNC_ARTIFACTS", "1") == "1"
+
+        if self.search_strategy not in ("grid", "random", "halving"):
+            raise ValueError(f"Unknown search strategy: {self.search_strategy}")
+
     def eval_metrics(self, actual, pred, pred_proba):
         accuracy = accuracy_score(actual, pred)
         precision = precision_score(actual, pred)
@@ -29,71 +197,165 @@ class ModelTrainer:
         roc_auc = roc_auc_score(actual, pred_proba)
         return accuracy, precision, recall, roc_auc
 
+    def get_model_configs(self):
+        return {
+            "Logistic_Regression": {
+                "model": LogisticRegression(max_iter=1000, random_state=42),
+                "params": {
+                    "C": [0.1, 1.0, 10.0],
+                    "solver": ["liblinear", "lbfgs"]
+                },
+                # Wider space sampled by the randomized search
+                "distributions": {
+                    "C": loguniform(1e-3, 1e2),
+                    "solver": ["liblinear", "lbfgs"]
+                }
+            },
+            "Random_Forest": {
+                "model": RandomForestClassifier(random_state=42),
+                "params": {
+                    "n_estimators": [50, 100, 200],
+                    "max_depth": [None, 10, 20],
+                    "min_samples_split": [2, 5]
+                },
+                "distributions": {
+                    "n_estimators": randint(50, 301),
+                    "max_depth": [None, 5, 10, 20, 30],
+                    "min_samples_split": randint(2, 11),
+                    "max_features": ["sqrt", "log2", None]
+                },
+                # Successive halving grows the forest instead of the sample count
+                "halving_resource": "n_estimators",
+                "max_resources": 200
+            }
+        }
+
+    def build_search(self, config, n_jobs):
+        """Creates the hyperparameter search for one model family using the configured strategy."""
+        common = dict(cv=5, scoring='accuracy', n_jobs=n_jobs)
+
+        if self.search_strategy == "random":
+            return RandomizedSearchCV(
+                config["model"], config.get("distributions", config["params"]),
+                n_iter=self.search_n_iter, random_state=42, **common
+            )
+
+        if self.search_strategy == "halving":
+            resource = config.get("halving_resource", "n_samples")
+            # The resource is allocated by the search, so it cannot also be a grid dimension
+            grid = {k: v for k, v in config["params"].items() if k != resource}
+            return HalvingGridSearchCV(
+                config["model"], grid, resource=resource,
+                max_resources=config.get("max_resources", "auto"),
+                factor=self.halving_factor, random_state=42, **common
+            )
+
+        return GridSearchCV(config["model"], config["params"], **common)
+
+    def describe_search_budget(self, search):
+        """Human-readable budget of a search, logged to MLflow next to its metrics."""
+        if isinstance(search, RandomizedSearchCV):
+            return f"n_iter={search.n_iter}"
+        if isinstance(search, HalvingGridSearchCV):
+            return f"resource={search.resource},max_resources={search.max_resources},factor={search.factor}"
+        return f"grid={len(search.cv_results_['params'])}" if hasattr(search, "cv_results_") else "grid"
+
+    def fit_searches(self, models, X_train, y_train):
+        """
+        Runs the hyperparameter search of every model family. Grid points and
+        folds are spread over n_jobs processes; with parallel_families the
+        families also run concurrently and share the cores between them.
+        Returns {model_name: (fitted_search, seconds)}. Does not touch MLflow.
+        """
+        total_jobs = os.cpu_count() if self.n_jobs == -1 else max(1, self.n_jobs)
+        parallel = self.parallel_families and len(models) > 1
+        inner_jobs = max(1, total_jobs // len(models)) if parallel else total_jobs
+
+        searches = {
+            model_name: self.build_search(config, inner_jobs)
+            for model_name, config in models.items()
+        }
+
+        if not parallel:
+            return {name: _fit_search(search, X_train, y_train, self.cache) for name, search in searches.items()}
+
+        with ProcessPoolExecutor(max_workers=len(searches)) as pool:
+            futures = {name: pool.submit(_fit_search, search, X_train, y_train, self.cache) for name, search in searches.items()}
+            return {name: future.result() for name, future in futures.items()}
+
+    def load_training_data(self):
+        """Features and target: a CSR matrix in sparse mode (never densified), else a DataFrame."""
+        if self.sparse:
+            X, y, feature_names = read_sparse(self.data_path)
+            logger.info(f"Loaded sparse features {X.shape} ({X.nnz} stored values, {len(feature_names)} names)")
+            return X, pd.Series(y, name='target')
+        df = read_table(self.data_path)
+        return df.drop(columns=['target']), df['target']
+
     def initiate_model_trainer(self):
         try:
             logger.info("Loading transformed data")
-            df = pd.read_csv(self.data_path)
-            X = df.drop(columns=['target'])
-            y = df['target']
+            X, y = self.load_training_data()
 
             X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
-            models = {
-                "Logistic_Regression": {
-                    "model": LogisticRegression(max_iter=1000),
-                    "params": {
-                        "C": [0.1, 1.0, 10.0],
-                        "solver": ["liblinear", "lbfgs"]
-                    }
-                },
-                "Random_Forest": {
-                    "model": RandomForestClassifier(),
-                    "params": {
-                        "n_estimators": [50, 100, 200],
-                        "max_depth": [None, 10, 20],
-                        "min_samples_split": [2, 5]
-                    }
-                }
-            }
+            models = self.get_model_configs()
 
+            # Fit all searches first (possibly in worker processes); MLflow is only used from this process
+            logger.info(f"Started {self.search_strategy} search for {list(models)} with n_jobs={self.n_jobs}, parallel_families={self.parallel_families}")
+            search_start = time.perf_counter()
+            fitted = self.fit_searches(models, X_train, y_train)
+            logger.info(f"Hyperparameter search finished in {time.perf_counter() - search_start:.2f}s")
+
+            logging_start = time.perf_counter()
             mlflow.set_experiment("Heart_Disease_Classification")
+            # Tags this invocation's runs so ModelEvaluator only has to compare them
+            training_batch = uuid.uuid4().hex
+
+            # Params/metrics are buffered into log_batch calls; plots and models upload in the background
+            with BatchedRunLogger(async_artifacts=self.async_artifacts) as tracker:
+                for model_name, (gs, search_seconds) in fitted.items():
+                    with mlflow.start_run(run_name=model_name) as run:
+                        run_id = run.info.run_id
+                        logger.info(f"Logging results for: {model_name}")
+
+                        best_model = gs.best_estimator_
+
+                        # Predictions
+                        y_pred = best_model.predict(X_test)
+                        y_prob = best_model.predict_proba(X_test)[:, 1]
+
+                        # Metrics
+                        acc, prec, rec, roc = self.eval_metrics(y_test, y_pred, y_prob)
+
+                        # Log Params and Metrics to MLflow, including every grid point's CV scores
+                        tracker.log_params(run_id, {
+                            **gs.best_params_,
+                            "search_strategy": self.search_strategy,
+                            "search_budget": self.describe_search_budget(gs),
+                            "input_format": "csr" if self.sparse else "dense",
+                        })
+                        tracker.log_metrics(run_id, {
+                            "search_candidates": len(gs.cv_results_["params"]),
+                            "accuracy": acc,
+                            "precision": prec,
+                            "recall": rec,
+                            "roc_auc": roc,
+                            "search_time_s": search_seconds,
+                        })
+                        tracker.log_cv_results(run_id, gs.cv_results_)
+                        tracker.set_tags(run_id, {"training_batch": training_batch})
+
+                        # Create and Log Confusion Matrix Plot
+                        if self.log_plots:
+                            tracker.submit(_log_confusion_matrix, tracker.client, run_id, y_test, y_pred, self.model_dir / f"{model_name}_cm.png")
+
+                        # Log the Model
+                        tracker.log_model(run_id, best_model, "model")
+
+                        logger.info(f"{model_name} training complete. Accuracy: {acc:.4f}")
 
-            for model_name, config in models.items():
-                with mlflow.start_run(run_name=model_name):
-                    logger.info(f"Started tuning and training for: {model_name}")
-                    
-                    # Hyperparameter Tuning using Cross-Validation
-                    gs = GridSearchCV(config["model"], config["params"], cv=5, scoring='accuracy')
-                    gs.fit(X_train, y_train)
-
-                    best_model = gs.best_estimator_
-                    
-                    # Predictions
-                    y_pred = best_model.predict(X_test)
-                    y_prob = best_model.predict_proba(X_test)[:, 1]
-
-                    # Metrics
-                    acc, prec, rec, roc = self.eval_metrics(y_test, y_pred, y_prob)
-
-                    # Log Params and Metrics to MLflow
-                    mlflow.log_params(gs.best_params_)
-                    mlflow.log_metric("accuracy", acc)
-                    mlflow.log_metric("precision", prec)
-                    mlflow.log_metric("recall", rec)
-                    mlflow.log_metric("roc_auc", roc)
-
-                    # Create and Log Confusion Matrix Plot
-                    plt.figure(figsize=(6,6))
-                    ConfusionMatrixDisplay.from_estimator(best_model, X_test, y_test)
-                    plot_path = self.model_dir / f"{model_name}_cm.png"
-                    plt.savefig(plot_path)
-                    mlflow.log_artifact(str(plot_path))
-                    plt.close()
-
-                    # Log the Model
-                    mlflow.sklearn.log_model(best_model, "model")
-                    
-                    logger.info(f"{model_name} training complete. Accuracy: {acc:.4f}")
+            logger.info(f"MLflow logging finished in {time.perf_counter() - logging_start:.2f}s")
 
         except Exception as e:
             raise CustomException(e, sys)
@@ -0,0 +1,214 @@
+import json
+import math
+import numpy as np
+import pandas as pd
+from collections import Counter
+from pathlib import Path
+
+QUANTILES = {"25%": 0.25, "50%": 0.5, "75%": 0.75}
+
+def category_key(value) -> str:
+    """JSON key for a category value, so 1, 1.0 and "1" share a frequency bucket."""
+    return format(float(value), "g")
+
+class QuantileSketch:
+    """
+    Log-bucketed quantile sketch (DDSketch). Every quantile is returned
+    within a relative error of alpha, memory grows with the log of the
+    value range rather than the row count, and two sketches merge by adding
+    their bucket counts.
+    """
+    def __init__(self, alpha=0.01):
+        self.alpha = alpha
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self.log_gamma = math.log(self.gamma)
+        self.zero_count = 0
+        self.positive = Counter()
+        self.negative = Counter()
+
+    def _add_buckets(self, store, magnitudes):
+        if len(magnitudes):
+            indices, counts = np.unique(np.ceil(np.log(magnitudes) / self.log_gamma).astype(np.int64), return_counts=True)
+            store.update(dict(zip(indices.tolist(), counts.tolist())))
+
+    def update(self, values: np.ndarray):
+        """Adds a batch of non-NaN values."""
+        self.zero_count += int(np.count_nonzero(values == 0))
+        self._add_buckets(self.positive, values[values > 0])
+        self._add_buckets(self.negative, -values[values < 0])
+
+    def merge(self, other):
+        if other.alpha != self.alpha:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        self.zero_count += other.zero_count
+        self.positive.update(other.positive)
+        self.negative.update(other.negative)
+        return self
+
+    @property
+    def count(self):
+        return self.zero_count + sum(self.positive.values()) + sum(self.negative.values())
+
+    def _value(self, index):
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def quantile(self, q):
+        total = self.count
+        if total == 0:
+            return float("nan")
+
+        # Same rank convention as pandas' linear interpolation, on the lower neighbour
+        rank, seen = q * (total - 1), 0
+        buckets = [(-self._value(i), n) for i, n in sorted(self.negative.items(), reverse=True)]
+        buckets += [(0.0, self.zero_count)]
+        buckets += [(self._value(i), n) for i, n in sorted(self.positive.items())]
+        for value, n in buckets:
+            seen += n
+            if seen > rank:
+                return value
+        return buckets[-1][0]
+
+    def to_dict(self):
+        return {
+            "alpha": self.alpha,
+            "zero_count": self.zero_count,
+            "positive": {str(i): n for i, n in self.positive.items()},
+            "negative": {str(i): n for i, n in self.negative.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        sketch = cls(state["alpha"])
+        sketch.zero_count = state["zero_count"]
+        sketch.positive = Counter({int(i): n for i, n in state["positive"].items()})
+        sketch.negative = Counter({int(i): n for i, n in state["negative"].items()})
+        return sketch
+
+class ColumnProfile:
+    """Count, mean, variance (Chan's parallel update), min, max and a quantile sketch for one column."""
+    def __init__(self, alpha=0.01):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+        self.sketch = QuantileSketch(alpha)
+
+    def _combine(self, count, mean, m2, min_, max_):
+        if count == 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.m2 += m2 + delta ** 2 * self.count * count / total
+        self.mean += delta * count / total
+        self.count = total
+        self.min = min(self.min, float(min_))
+        self.max = max(self.max, float(max_))
+
+    def update(self, values: np.ndarray):
+        values = values[~np.isnan(values)]
+        if len(values):
+            mean = values.mean()
+            self._combine(len(values), mean, float(((values - mean) ** 2).sum()), values.min(), values.max())
+            self.sketch.update(values)
+
+    def merge(self, other):
+        self._combine(other.count, other.mean, other.m2, other.min, other.max)
+        self.sketch.merge(other.sketch)
+        return self
+
+    def describe(self):
+        """Same keys as pandas.Series.describe() for a numeric column."""
+        stats = {
+            "count": float(self.count),
+            "mean": self.mean if self.count else float("nan"),
+            "std": math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else float("nan"),
+            "min": self.min if self.count else float("nan"),
+        }
+        for name, q in QUANTILES.items():
+            # Sketch values are bucket midpoints; never report beyond the observed range
+            stats[name] = min(max(self.sketch.quantile(q), self.min), self.max) if self.count else float("nan")
+        stats["max"] = self.max if self.count else float("nan")
+        return stats
+
+    def to_dict(self):
+        return {"count": self.count, "mean": self.mean, "m2": self.m2, "min": self.min, "max": self.max, "sketch": self.sketch.to_dict()}
+
+    @classmethod
+    def from_dict(cls, state):
+        profile = cls()
+        profile.count, profile.mean, profile.m2 = state["count"], state["mean"], state["m2"]
+        profile.min, profile.max = state["min"], state["max"]
+        profile.sketch = QuantileSketch.from_dict(state["sketch"])
+        return profile
+
+class DataProfiler:
+    """
+    One-pass, mergeable replacement for DataFrame.describe(). Feed it chunks
+    with update() (or combine per-chunk / per-worker profilers with merge())
+    and export a describe()-shaped profile plus frequency tables for the
+    categorical features and the state needed to keep merging later.
+    """
+    def __init__(self, categorical_features=(), alpha=0.01):
+        self.categorical_features = list(categorical_features)
+        self.alpha = alpha
+        self.columns = {}
+        self.frequencies = {}
+
+    def update(self, chunk: pd.DataFrame):
+        for col in chunk.select_dtypes(include="number").columns:
+            profile = self.columns.setdefault(col, ColumnProfile(self.alpha))
+            profile.update(chunk[col].to_numpy(dtype=np.float64))
+
+        for col in self.categorical_features:
+            if col in chunk.columns:
+                counts = chunk[col].dropna().value_counts()
+                table = self.frequencies.setdefault(col, Counter())
+                table.update({category_key(value): int(n) for value, n in counts.items()})
+        return self
+
+    def merge(self, other):
+        for col, profile in other.columns.items():
+            self.columns.setdefault(col, ColumnProfile(self.alpha)).merge(profile)
+        for col, table in other.frequencies.items():
+            self.frequencies.setdefault(col, Counter()).update(table)
+        return self
+
+    def describe(self):
+        return {col: profile.describe() for col, profile in self.columns.items()}
+
+    def state_dict(self):
+        """Mergeable state: category frequencies and per-column sketch state."""
+        return {
+            "_frequencies": {col: dict(table) for col, table in self.frequencies.items()},
+            "_state": {col: column.to_dict() for col, column in self.columns.items()},
+        }
+
+    def to_dict(self):
+        """describe()-shaped stats per column plus the state_dict() keys."""
+        return {**self.describe(), **self.state_dict()}
+
+    def save(self, path):
+        """
+        Writes describe() to path, in the column -> stats shape of
+        DataFrame.describe, and the mergeable state next to it in
+        <name>.state.json (see state_path).
+        """
+        with open(path, "w") as f:
+            json.dump(self.describe(), f)
+        with open(state_path(path), "w") as f:
+            json.dump(self.state_dict(), f)
+
+    @classmethod
+    def from_dict(cls, profile, categorical_features=None):
+        """Restores a profiler from to_dict() or state_dict() output."""
+        frequencies = profile.get("_frequencies", {})
+        alphas = {state["sketch"]["alpha"] for state in profile["_state"].values()} or {0.01}
+        profiler = cls(categorical_features if categorical_features is not None else list(frequencies), alphas.pop())
+        profiler.columns = {col: ColumnProfile.from_dict(state) for col, state in profile["_state"].items()}
+        profiler.frequencies = {col: Counter(table) for col, table in frequencies.items()}
+        return profiler
+
+def state_path(path) -> Path:
+    """Sidecar of a saved profile holding its mergeable state: data_profile.json -> data_profile.state.json."""
+    return Path(path).with_suffix(".state.json")
@@ -0,0 +1,166 @@
+import os
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from src.logger import logger
+
+# Format of the intermediate tables passed between DVC stages: "parquet", "feather" or "csv"
+DATA_FORMAT = os.getenv("PIPELINE_DATA_FORMAT", "parquet")
+# Also write a .csv copy of every intermediate table (for manual inspection / legacy tools)
+EXPORT_CSV = os.getenv("PIPELINE_EXPORT_CSV", "0") == "1"
+
+SUFFIXES = {"parquet": ".parquet", "feather": ".feather", "csv": ".csv"}
+
+# Keep the transformed feature matrix in CSR form (an .npz artifact) instead of a dense table
+SPARSE = os.getenv("PIPELINE_SPARSE", "0") == "1"
+
+def table_path(path, fmt=None) -> Path:
+    """Returns the path of a table in the given (or configured) storage format."""
+    fmt = fmt or DATA_FORMAT
+    if fmt not in SUFFIXES:
+        raise ValueError(f"Unsupported data format: {fmt}")
+    return Path(path).with_suffix(SUFFIXES[fmt])
+
+def write_table(df: pd.DataFrame, path, fmt=None, export_csv=None) -> Path:
+    """
+    Writes a DataFrame in a typed columnar format so dtypes and column names
+    survive the round trip. Returns the path written.
+    """
+    fmt = fmt or DATA_FORMAT
+    out_path = table_path(path, fmt)
+    os.makedirs(out_path.parent, exist_ok=True)
+
+    # Columnar formats require string column names
+    df = df.rename(columns=str)
+
+    if fmt == "parquet":
+        df.to_parquet(out_path, index=False)
+    elif fmt == "feather":
+        df.reset_index(drop=True).to_feather(out_path)
+    else:
+        df.to_csv(out_path, index=False)
+
+    if (EXPORT_CSV if export_csv is None else export_csv) and fmt != "csv":
+        df.to_csv(table_path(path, "csv"), index=False)
+
+    logger.info(f"Saved {len(df)} rows x {df.shape[1]} columns to {out_path}")
+    return out_path
+
+def read_table(path, columns=None) -> pd.DataFrame:
+    """
+    Reads a table written by write_table. The configured format is tried
+    first, then the other formats, so older CSV artifacts still load.
+    """
+    candidates = [DATA_FORMAT] + [fmt for fmt in SUFFIXES if fmt != DATA_FORMAT]
+    for fmt in candidates:
+        in_path = table_path(path, fmt)
+        if not in_path.exists():
+            continue
+        if fmt == "parquet":
+            return pd.read_parquet(in_path, columns=columns)
+        if fmt == "feather":
+            return pd.read_feather(in_path, columns=columns)
+        return pd.read_csv(in_path, usecols=columns)
+
+    raise FileNotFoundError(f"No table found for {Path(path).with_suffix('')} in formats {candidates}")
+
+def iter_table(path, chunksize, columns=None):
+    """
+    Yields a table written by write_table / TableWriter as DataFrames of at
+    most chunksize rows, without loading it whole (feather is read at once).
+    """
+    candidates = [DATA_FORMAT] + [fmt for fmt in SUFFIXES if fmt != DATA_FORMAT]
+    for fmt in candidates:
+        in_path = table_path(path, fmt)
+        if not in_path.exists():
+            continue
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+            for batch in pq.ParquetFile(in_path).iter_batches(batch_size=chunksize, columns=columns):
+                yield batch.to_pandas()
+        elif fmt == "feather":
+            df = pd.read_feather(in_path, columns=columns)
+            for start in range(0, len(df), chunksize):
+                yield df.iloc[start:start + chunksize]
+        else:
+            yield from pd.read_csv(in_path, usecols=columns, chunksize=chunksize)
+        return
+
+    raise FileNotFoundError(f"No table found for {Path(path).with_suffix('')} in formats {candidates}")
+
+def sparse_path(path) -> Path:
+    return Path(path).with_suffix(".npz")
+
+def write_sparse(matrix, target, feature_names, path) -> Path:
+    """
+    Saves a feature matrix as a compressed CSR artifact together with its
+    feature names and the target, without densifying it. Returns the path.
+    """
+    import scipy.sparse as sp
+
+    matrix = sp.csr_matrix(matrix)
+    out_path = sparse_path(path)
+    os.makedirs(out_path.parent, exist_ok=True)
+    np.savez_compressed(
+        out_path,
+        data=matrix.data, indices=matrix.indices, indptr=matrix.indptr, shape=np.array(matrix.shape),
+        feature_names=np.array([str(name) for name in feature_names]), target=np.asarray(target)
+    )
+    logger.info(f"Saved {matrix.shape[0]} rows x {matrix.shape[1]} columns ({matrix.nnz} stored values) to {out_path}")
+    return out_path
+
+def read_sparse(path):
+    """Loads an artifact written by write_sparse as (CSR matrix, target array, feature names)."""
+    import scipy.sparse as sp
+
+    with np.load(sparse_path(path)) as arrays:
+        matrix = sp.csr_matrix((arrays["data"], arrays["indices"], arrays["indptr"]), shape=tuple(arrays["shape"]))
+        return matrix, arrays["target"], arrays["feature_names"].tolist()
+
+class TableWriter:
+    """
+    Appends DataFrame chunks to a single table without holding them all in
+    memory. Supports parquet (one row group per chunk) and csv; feather
+    files cannot be appended to.
+    """
+    def __init__(self, path, fmt=None, export_csv=None):
+        self.fmt = fmt or DATA_FORMAT
+        if self.fmt == "feather":
+            raise ValueError("Feather does not support incremental writes; use parquet or csv")
+
+        self.path = table_path(path, self.fmt)
+        self.csv_path = table_path(path, "csv") if (EXPORT_CSV if export_csv is None else export_csv) and self.fmt != "csv" else None
+        self.rows = 0
+        self._parquet_writer = None
+        os.makedirs(self.path.parent, exist_ok=True)
+
+    def write(self, df: pd.DataFrame):
+        df = df.rename(columns=str)
+        first = self.rows == 0
+
+        if self.fmt == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            self._parquet_writer.write_table(table)
+        else:
+            df.to_csv(self.path, mode="w" if first else "a", header=first, index=False)
+
+        if self.csv_path is not None:
+            df.to_csv(self.csv_path, mode="w" if first else "a", header=first, index=False)
+
+        self.rows += len(df)
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+        logger.info(f"Saved {self.rows} rows to {self.path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
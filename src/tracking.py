@@ -0,0 +1,114 @@
+import json
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import mlflow
+import mlflow.sklearn
+from mlflow.entities import Metric, Param, RunTag
+from mlflow.tracking import MlflowClient
+from mlflow.utils.validation import MAX_ENTITIES_PER_BATCH, MAX_METRICS_PER_BATCH, MAX_PARAMS_TAGS_PER_BATCH, MAX_PARAM_VAL_LENGTH
+
+from src.logger import logger
+
+class BatchedRunLogger:
+    """
+    Buffers params, metrics and tags per MLflow run and writes them with as
+    few log_batch calls as the tracking store limits allow. Artifact jobs
+    (plots, models) run on one background thread so training does not wait
+    on uploads; they address runs by ID through the client and never touch
+    the fluent active-run stack, which is shared with the main thread in
+    older MLflow versions. Call flush() (or close()) at the end; it writes
+    the buffers, waits for the artifact jobs and re-raises the first failure.
+    """
+    def __init__(self, async_artifacts=True, client=None):
+        self.client = client or MlflowClient()
+        self._metrics = defaultdict(list)
+        self._params = defaultdict(dict)
+        self._tags = defaultdict(dict)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mlflow-artifacts") if async_artifacts else None
+        self._futures = []
+
+    def log_params(self, run_id, params):
+        self._params[run_id].update({key: str(value)[:MAX_PARAM_VAL_LENGTH] for key, value in params.items()})
+
+    def log_metrics(self, run_id, metrics, step=0):
+        timestamp = int(time.time() * 1000)
+        self._metrics[run_id].extend(Metric(key, float(value), timestamp, step) for key, value in metrics.items())
+
+    def set_tags(self, run_id, tags):
+        self._tags[run_id].update({key: str(value) for key, value in tags.items()})
+
+    def log_cv_results(self, run_id, cv_results):
+        """
+        Per-grid-point search results: mean/std and per-fold test scores as
+        metrics with the candidate index as step, candidate params as params.
+        """
+        for i, candidate in enumerate(cv_results["params"]):
+            self.log_params(run_id, {f"cv_candidate_{i}": json.dumps(candidate, default=str, sort_keys=True)})
+            scores = {
+                key: values[i] for key, values in cv_results.items()
+                if key.endswith("_test_score") and not key.startswith("rank")
+            }
+            self.log_metrics(run_id, {f"cv_{key}": value for key, value in scores.items()}, step=i)
+
+    def submit(self, fn, *args):
+        """Runs fn(*args) on the background thread, or now when synchronous."""
+        if self._executor is None:
+            fn(*args)
+            return
+        self._futures.append(self._executor.submit(fn, *args))
+
+    def log_artifact(self, run_id, local_path, artifact_path=None):
+        self.submit(self.client.log_artifact, run_id, str(local_path), artifact_path)
+
+    def log_model(self, run_id, model, artifact_path="model"):
+        """Saves a scikit-learn model in the MLflow format and uploads it to the run."""
+        self.submit(_log_sklearn_model, self.client, run_id, model, artifact_path)
+
+    def _write_batches(self, run_id):
+        metrics = self._metrics.pop(run_id, [])
+        params = [Param(key, value) for key, value in self._params.pop(run_id, {}).items()]
+        tags = [RunTag(key, value) for key, value in self._tags.pop(run_id, {}).items()]
+
+        calls = 0
+        while metrics or params or tags:
+            batch_params, params = params[:MAX_PARAMS_TAGS_PER_BATCH], params[MAX_PARAMS_TAGS_PER_BATCH:]
+            batch_tags, tags = tags[:MAX_PARAMS_TAGS_PER_BATCH - len(batch_params)], tags[MAX_PARAMS_TAGS_PER_BATCH - len(batch_params):]
+            room = min(MAX_METRICS_PER_BATCH, MAX_ENTITIES_PER_BATCH - len(batch_params) - len(batch_tags))
+            batch_metrics, metrics = metrics[:room], metrics[room:]
+            self.client.log_batch(run_id, metrics=batch_metrics, params=batch_params, tags=batch_tags)
+            calls += 1
+        return calls
+
+    def flush(self):
+        runs = set(self._metrics) | set(self._params) | set(self._tags)
+        calls = sum(self._write_batches(run_id) for run_id in runs)
+        if calls:
+            logger.info(f"Logged params and metrics of {len(runs)} runs in {calls} log_batch calls")
+
+        futures, self._futures = self._futures, []
+        for future in futures:
+            future.result()
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def _log_sklearn_model(client, run_id, model, artifact_path):
+    # mlflow.sklearn.log_model needs an active run; save locally and upload by run ID instead
+    with tempfile.TemporaryDirectory() as tmp:
+        local_path = Path(tmp) / artifact_path
+        mlflow.sklearn.save_model(model, str(local_path))
+        client.log_artifacts(run_id, str(local_path), artifact_path)
@@ -2,18 +2,26 @@ import os
 import sys
 import pandas as pd
 import joblib
+from scipy.sparse import issparse
 from pathlib import Path
 from sklearn.preprocessing import StandardScaler, OneHotEncoder
 from sklearn.compose import ColumnTransformer
 from src.logger import logger
 from src.exception import CustomException
+from src.storage import SPARSE, table_path, read_table, write_table, sparse_path, write_sparse
+from src.cache import StageCache
 
 class DataTransformation:
-    def __init__(self):
+    def __init__(self, sparse=None):
         self.project_root = Path(__file__).resolve().parent.parent
-        self.processed_data_path = self.project_root / "data" / "processed" / "heart_cleaned.csv"
-        self.transformed_data_path = self.project_root / "data" / "processed" / "heart_transformed.csv"
+        self.processed_data_path = table_path(self.project_root / "data" / "processed" / "heart_cleaned")
+
+        # Sparse mode keeps the encoded matrix in CSR form end to end (heart_transformed.npz)
+        self.sparse = sparse if sparse is not None else SPARSE
+        transformed = self.project_root / "data" / "processed" / "heart_transformed"
+        self.transformed_data_path = sparse_path(transformed) if self.sparse else table_path(transformed)
         self.preprocessor_obj_file_path = self.project_root / "models" / "preprocessor.pkl"
+        self.cache = StageCache()
 
     def get_data_transformer_object(self):
         """Creates a ColumnTransformer object for scaling and encoding."""
@@ -35,7 +43,9 @@ class DataTransformation:
                 [
                     ("num_pipeline", num_pipeline, numerical_columns),
                     ("cat_pipeline", cat_pipeline, categorical_columns)
-                ]
+                ],
+                # Sparse mode: always stack into a sparse matrix, whatever the overall density
+                sparse_threshold=1.0 if self.sparse else 0.3
             )
             return preprocessor
 
@@ -45,7 +55,7 @@ class DataTransformation:
     def initiate_data_transformation(self):
         try:
             logger.info("Reading processed data for transformation")
-            df = pd.read_csv(self.processed_data_path)
+            df = read_table(self.processed_data_path)
 
             target_column_name = "target"
             input_feature_df = df.drop(columns=[target_column_name], axis=1)
@@ -53,17 +63,35 @@ class DataTransformation:
 
             logger.info("Applying preprocessing object on training and testing dataframes")
             preprocessing_obj = self.get_data_transformer_object()
-            
+
+            # Reuse the fitted preprocessor when the input data, this stage's code and the
+            # transformer configuration are unchanged
+            cache_key = self.cache.key(
+                "preprocessor", Path(self.processed_data_path), Path(__file__).resolve(), preprocessing_obj.get_params()
+            )
+            cached_obj = self.cache.get(cache_key)
+
             # Transform features
-            input_feature_arr = preprocessing_obj.fit_transform(input_feature_df)
+            if cached_obj is not None:
+                logger.info("Input unchanged; reusing cached fitted preprocessor")
+                preprocessing_obj = cached_obj
+                input_feature_arr = preprocessing_obj.transform(input_feature_df)
+            else:
+                input_feature_arr = preprocessing_obj.fit_transform(input_feature_df)
+                self.cache.set(cache_key, preprocessing_obj)
 
-            # Combine transformed features and target
-            # Note: OneHotEncoder returns a sparse matrix or dense array depending on settings
-            transformed_df = pd.DataFrame(input_feature_arr)
-            transformed_df[target_column_name] = target_feature_df.values
+            if self.sparse:
+                # CSR matrix, feature names and target in one compressed artifact; never densified
+                write_sparse(input_feature_arr, target_feature_df.values, preprocessing_obj.get_feature_names_out(), self.transformed_data_path)
+            else:
+                # Combine transformed features and target, keeping the transformer's feature names
+                if issparse(input_feature_arr):
+                    input_feature_arr = input_feature_arr.toarray()
+                transformed_df = pd.DataFrame(input_feature_arr, columns=preprocessing_obj.get_feature_names_out())
+                transformed_df[target_column_name] = target_feature_df.values
 
-            # Save transformed data
-            transformed_df.to_csv(self.transformed_data_path, index=False)
+                # Save transformed data
+                write_table(transformed_df, self.transformed_data_path)
             
             # Save the preprocessor for inference later
             os.makedirs(os.path.dirname(self.preprocessor_obj_file_path), exist_ok=True)
@@ -0,0 +1,32 @@
+import mlflow
+import numpy as np
+import pandas as pd
+import pytest
+from mlflow.tracking import MlflowClient
+
+@pytest.fixture
+def isolated_tracking(tmp_path, monkeypatch):
+    """Temporary MLflow file store (and registry) so tests do not touch mlruns/; yields its client."""
+    previous = mlflow.get_tracking_uri()
+    # Forget any experiment set by earlier tests; runs created by ID go to the store's default experiment
+    # (set_experiment records it in both places)
+    monkeypatch.setattr(mlflow.tracking.fluent, "_active_experiment_id", None)
+    monkeypatch.delenv("MLFLOW_EXPERIMENT_ID", raising=False)
+    mlflow.set_tracking_uri(f"file:{tmp_path / 'mlruns'}")
+    yield MlflowClient()
+    mlflow.set_tracking_uri(previous)
+
+@pytest.fixture
+def make_frame():
+    """Factory of synthetic UCI-like feature frames (numeric and categorical columns) for the profiling and drift tests."""
+    def make(n=2000, seed=0):
+        rng = np.random.default_rng(seed)
+        return pd.DataFrame({
+            "age": rng.integers(29, 78, n).astype(float),
+            "chol": rng.normal(250, 50, n).round(),
+            "oldpeak": np.round(rng.exponential(1.0, n), 1),
+            "shift": rng.normal(0, 5, n),
+            "cp": rng.integers(1, 5, n),
+            "thal": rng.choice([3.0, 6.0, 7.0], n),
+        })
+    return make
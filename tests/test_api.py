@@ -0,0 +1,200 @@
+import os
+import pytest
+
+if not (os.path.exists("models/best_model.pkl") and os.path.exists("models/preprocessor.pkl")):
+    pytest.skip("Model artifacts missing", allow_module_level=True)
+
+from fastapi.testclient import TestClient
+from app import main
+from app.main import app
+
+client = TestClient(app)
+
+@pytest.fixture(scope="module", autouse=True)
+def started_app():
+    # Runs the lifespan: the model is loaded and warmed up in the background
+    with client:
+        assert main.startup.wait(timeout=60), main.startup.status()
+        yield
+
+SAMPLE_PATIENT = {
+    "age": 63, "sex": 1, "cp": 1, "trestbps": 145, "chol": 233,
+    "fbs": 1, "restecg": 2, "thalach": 150, "exang": 0,
+    "oldpeak": 2.3, "slope": 3, "ca": 0, "thal": 6
+}
+
+def test_predict_single():
+    response = client.post("/predict", json=SAMPLE_PATIENT)
+    assert response.status_code == 200
+    assert response.json()["prediction"] in [0, 1]
+
+def test_predict_batch_matches_single():
+    """Batch results must agree with the single-record endpoint."""
+    single = client.post("/predict", json=SAMPLE_PATIENT).json()
+    response = client.post("/predict/batch", json={"patients": [SAMPLE_PATIENT, SAMPLE_PATIENT]})
+    assert response.status_code == 200
+
+    body = response.json()
+    assert body["n_valid"] == 2
+    for result in body["results"]:
+        assert result["prediction"] == single["prediction"]
+        assert result["confidence"] == single["confidence"]
+
+def test_predict_batch_columnar():
+    columns = {key: [value, value] for key, value in SAMPLE_PATIENT.items()}
+    response = client.post("/predict/batch", json={"columns": columns})
+    assert response.status_code == 200
+    assert response.json()["n_valid"] == 2
+
+def test_predict_batch_per_item_errors():
+    """An invalid record is reported individually without failing the batch."""
+    bad_patient = {**SAMPLE_PATIENT, "age": "not-a-number"}
+    response = client.post("/predict/batch", json={"patients": [SAMPLE_PATIENT, bad_patient]})
+    assert response.status_code == 200
+
+    body = response.json()
+    assert body["n_valid"] == 1 and body["n_invalid"] == 1
+    assert "prediction" in body["results"][0]
+    assert "error" in body["results"][1]
+
+def test_predict_batch_size_limit():
+    response = client.post("/predict/batch", json={"patients": [SAMPLE_PATIENT] * (main.MAX_BATCH_SIZE + 1)})
+    assert response.status_code == 413
+
+def test_predict_uses_decision_threshold():
+    """The label follows the positive-class probability and the configured threshold."""
+    body = client.post("/predict", json=SAMPLE_PATIENT).json()
+    assert body["threshold"] == main.DECISION_THRESHOLD
+    assert body["prediction"] == int(body["probability"] > main.DECISION_THRESHOLD)
+
+    original = main.DECISION_THRESHOLD
+    try:
+        main.DECISION_THRESHOLD = 0.0
+        assert client.post("/predict", json=SAMPLE_PATIENT).json()["prediction"] == 1
+        main.DECISION_THRESHOLD = 1.0
+        assert client.post("/predict", json=SAMPLE_PATIENT).json()["prediction"] == 0
+    finally:
+        main.DECISION_THRESHOLD = original
+
+def test_admin_reload_reports_active_version():
+    body = client.post("/admin/reload").json()
+    assert body["reloaded"] is False
+    assert client.post("/predict", json=SAMPLE_PATIENT).json()["model_version"] == body["model_version"]
+
+def test_predict_imputes_null_fields():
+    """Explicit nulls are scored with the fitted fill values, or rejected when no imputer is loaded."""
+    bundle = main.registry.current()
+    if bundle.fill_values is None:
+        pytest.skip("Imputer artifact missing")
+
+    partial = {**SAMPLE_PATIENT, "ca": None, "thal": None}
+    filled = {**SAMPLE_PATIENT, "ca": bundle.fill_values["ca"], "thal": bundle.fill_values["thal"]}
+    response = client.post("/predict", json=partial)
+    assert response.status_code == 200
+    assert response.json()["probability"] == client.post("/predict", json=filled).json()["probability"]
+
+    fill_values = bundle.fill_values
+    try:
+        bundle.fill_values = None
+        assert client.post("/predict", json=partial).status_code == 422
+        body = client.post("/predict/batch", json={"patients": [SAMPLE_PATIENT, partial]}).json()
+        assert body["n_valid"] == 1 and body["n_invalid"] == 1
+    finally:
+        bundle.fill_values = fill_values
+
+def test_predict_rejects_omitted_and_unknown_fields():
+    """Only explicit nulls are imputed: missing or misspelled keys are validation errors."""
+    omitted = {key: value for key, value in SAMPLE_PATIENT.items() if key != "thal"}
+    misspelled = {**omitted, "thall": 6}
+    for record in ({}, {"age": 63}, omitted, misspelled):
+        assert client.post("/predict", json=record).status_code == 422
+
+    body = client.post("/predict/batch", json={"patients": [SAMPLE_PATIENT, omitted, misspelled]}).json()
+    assert body["n_valid"] == 1 and body["n_invalid"] == 2
+
+def test_requests_feed_drift_monitor():
+    if main.drift_monitor is None:
+        pytest.skip("Data profile missing")
+
+    client.post("/predict/batch", json={"patients": [SAMPLE_PATIENT] * 5})
+    scores = main.drift_monitor.snapshot()
+    assert scores["age"]["samples"] >= 5
+    assert scores["age"]["psi"] > 0  # five identical patients do not look like the training data
+
+def test_repeated_payloads_hit_prediction_cache():
+    """Identical payloads are answered from the cache until the model is swapped."""
+    from app.prediction_cache import CACHE_REQUESTS
+    if main.prediction_cache is None:
+        pytest.skip("Prediction cache disabled")
+
+    patient = {**SAMPLE_PATIENT, "chol": 321}
+    first = client.post("/predict", json=patient).json()
+    hits = CACHE_REQUESTS.labels(result="hit")._value.get()
+    second = client.post("/predict", json={**patient, "oldpeak": 2.3, "age": 63.0}).json()
+    assert CACHE_REQUESTS.labels(result="hit")._value.get() == hits + 1
+    assert second == first
+
+    # Subscribers run on every swap, which empties the cache
+    for callback in main.registry._subscribers:
+        callback(main.registry.current())
+    client.post("/predict", json=patient)
+    assert CACHE_REQUESTS.labels(result="hit")._value.get() == hits + 1
+    assert "prediction_cache_requests_total" in client.get("/metrics").text
+
+def test_stage_latency_histograms():
+    """Each inference stage is timed and labelled with the serving model."""
+    from prometheus_client import REGISTRY
+    bundle = main.registry.current()
+
+    def count(stage):
+        labels = {"stage": stage, "model": bundle.name, "version": bundle.version}
+        return REGISTRY.get_sample_value("predict_stage_duration_seconds_count", labels) or 0
+
+    before = {stage: count(stage) for stage in ("validation", "build_input", "preprocess", "predict_proba", "postprocess")}
+    client.post("/predict/batch", json={"patients": [{**SAMPLE_PATIENT, "chol": 400 + i} for i in range(3)]})
+    after = {stage: count(stage) for stage in before}
+
+    assert after["validation"] == before["validation"] + 3  # once per record
+    for stage in ("build_input", "preprocess", "predict_proba", "postprocess"):
+        assert after[stage] == before[stage] + 1  # once per scoring call
+
+def test_profile_header_writes_folded_stacks(tmp_path):
+    enabled, directory = main.PROFILING_ENABLED, main.PROFILE_DIR
+    try:
+        main.PROFILING_ENABLED, main.PROFILE_DIR = True, tmp_path
+        response = client.post("/predict", json=SAMPLE_PATIENT, headers={"X-Profile": "1"})
+        assert response.status_code == 200
+        assert os.path.exists(response.headers["X-Profile-Path"])
+
+        response = client.post("/predict/batch", json={"patients": [SAMPLE_PATIENT]}, headers={"X-Profile": "1"})
+        assert response.json()["n_valid"] == 1
+        assert "predict_batch" in response.headers["X-Profile-Path"]
+
+        folded = client.post("/admin/profile", params={"seconds": 0.05}).text
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in folded.splitlines())
+    finally:
+        main.PROFILING_ENABLED, main.PROFILE_DIR = enabled, directory
+
+    assert client.post("/admin/profile", params={"seconds": 0}).status_code == 404
+    assert "X-Profile-Path" not in client.post("/predict", json=SAMPLE_PATIENT, headers={"X-Profile": "1"}).headers
+
+def test_probes_report_startup_state():
+    """/healthz is up while loading; /readyz and predictions wait for the warm-up."""
+    from app.startup import StartupState
+
+    body = client.get("/readyz").json()
+    assert body["ready"] and body["model_version"] == main.registry.current().version
+    assert {"import", "load", "warm_up", "total"} <= set(body["timings_s"])
+    assert 'api_startup_seconds{phase="warm_up"}' in client.get("/metrics").text
+
+    state = main.startup
+    try:
+        main.startup = StartupState()
+        assert client.get("/healthz").status_code == 200
+        assert client.get("/readyz").status_code == 503
+        assert client.post("/predict", json=SAMPLE_PATIENT).status_code == 503
+
+        main.startup.mark_failed(RuntimeError("artifacts missing"))
+        assert client.get("/healthz").status_code == 500
+    finally:
+        main.startup = state
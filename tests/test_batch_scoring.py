@@ -0,0 +1,53 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.batch_scoring import BatchScorer
+from src.storage import read_table
+
+@pytest.fixture
+def patients(tmp_path):
+    scorer = BatchScorer()
+    if not scorer.model_path.exists() or not scorer.preprocessor_path.exists():
+        pytest.skip("Model artifacts missing")
+    df = read_table(scorer.project_root / "data" / "processed" / "heart_cleaned").drop(columns=["target"])
+    df = pd.concat([df] * 3, ignore_index=True)
+    df["patient_id"] = np.arange(len(df))
+    path = tmp_path / "patients.csv"
+    df.to_csv(path, index=False)
+    return df, path
+
+def test_parallel_scoring_keeps_order_and_matches_model(patients, tmp_path):
+    """Chunks scored by a process pool come back in input order with the sklearn probabilities."""
+    df, path = patients
+    serial = BatchScorer(n_jobs=1, chunksize=100)
+    parallel = BatchScorer(n_jobs=2, chunksize=100, max_pending=3)
+
+    assert serial.score(path, tmp_path / "serial.parquet", ["patient_id"]) == len(df)
+    assert parallel.score(path, tmp_path / "parallel.parquet", ["patient_id"]) == len(df)
+
+    result = pd.read_parquet(tmp_path / "parallel.parquet")
+    assert result.equals(pd.read_parquet(tmp_path / "serial.parquet"))
+    assert result["patient_id"].tolist() == df["patient_id"].tolist()
+
+    model = joblib.load(serial.model_path)
+    preprocessor = joblib.load(serial.preprocessor_path)
+    expected = model.predict_proba(preprocessor.transform(df.drop(columns=["patient_id"])))[:, list(model.classes_).index(1)]
+    np.testing.assert_allclose(result["probability"], expected)
+    assert (result["prediction"] == (expected > serial.threshold)).all()
+
+def test_rows_without_imputer_are_left_unscored(patients, tmp_path):
+    """Without models/imputer.json a row with a missing field gets no prediction instead of failing the run."""
+    df, path = patients
+    df.loc[1, "chol"] = np.nan
+    df.to_csv(path, index=False)
+
+    scorer = BatchScorer(n_jobs=1, chunksize=50)
+    scorer.imputer_path = tmp_path / "missing.json"
+    scorer.score(path, tmp_path / "out.csv")
+
+    result = pd.read_csv(tmp_path / "out.csv")
+    assert list(result.columns) == ["probability", "prediction"]
+    assert np.isnan(result.loc[1, "probability"]) and pd.isna(result.loc[1, "prediction"])
+    assert result.drop(index=1)["probability"].notna().all()
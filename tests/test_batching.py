@@ -0,0 +1,19 @@
+import asyncio
+from app.batching import MicroBatcher
+
+def test_micro_batcher_coalesces_requests():
+    """Concurrent submissions are evaluated together and fanned back in order."""
+    batch_sizes = []
+    def score(records):
+        batch_sizes.append(len(records))
+        return [record["id"] * 2 for record in records]
+
+    async def run():
+        batcher = MicroBatcher(score, max_batch_size=8, max_wait_ms=50)
+        results = await asyncio.gather(*[batcher.submit({"id": i}) for i in range(8)])
+        await batcher.stop()
+        return results
+
+    results = asyncio.run(run())
+    assert batch_sizes == [8]
+    assert results == [i * 2 for i in range(8)]
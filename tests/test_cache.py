@@ -0,0 +1,114 @@
+import time
+import numpy as np
+import pytest
+from pathlib import Path
+from src.cache import StageCache
+
+def test_cache_round_trip(tmp_path):
+    cache = StageCache(cache_dir=tmp_path, enabled=True)
+    key = cache.key("stage", {"param": 1})
+    assert cache.get(key) is None
+
+    cache.set(key, [0.5, 0.75])
+    assert cache.get(key) == [0.5, 0.75]
+    assert cache.key("stage", {"param": 2}) != key
+
+def test_file_content_changes_key(tmp_path):
+    cache = StageCache(cache_dir=tmp_path / "cache", enabled=True)
+    data = tmp_path / "data.csv"
+    data.write_text("a\n1\n")
+    first = cache.key(data)
+    data.write_text("a\n2\n")
+    assert cache.key(data) != first
+
+def test_lru_eviction(tmp_path):
+    """Least recently used entries are removed once the size bound is exceeded."""
+    cache = StageCache(cache_dir=tmp_path, max_mb=0.15, enabled=True)
+    payload = b"x" * 60 * 1024
+
+    cache.set("aa1", payload)
+    time.sleep(0.01)
+    cache.set("bb2", payload)
+    time.sleep(0.01)
+    cache.get("aa1")  # touch: "bb2" becomes the oldest entry
+    time.sleep(0.01)
+    cache.set("cc3", payload)
+
+    assert cache.get("aa1") is not None
+    assert cache.get("bb2") is None
+    assert cache.get("cc3") is not None
+
+def test_cached_search_matches_grid_search(tmp_path):
+    """Cached cross-validation picks the same candidate as GridSearchCV, including new grid points."""
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.model_selection import GridSearchCV
+    from src.model_trainer import ModelTrainer
+    from src.storage import read_table
+
+    trainer = ModelTrainer(n_jobs=1)
+    if not trainer.data_path.exists():
+        pytest.skip("Transformed data missing")
+    trainer.cache = StageCache(cache_dir=tmp_path, enabled=True)
+
+    df = read_table(trainer.data_path)
+    X, y = df.drop(columns=['target']), df['target']
+
+    for grid in ([0.1, 1.0], [0.1, 1.0, 10.0]):
+        models = {"Logistic_Regression": {"model": LogisticRegression(max_iter=1000, random_state=0), "params": {"C": grid}}}
+        search, _ = trainer.fit_searches(models, X, y)["Logistic_Regression"]
+        reference = GridSearchCV(LogisticRegression(max_iter=1000, random_state=0), {"C": grid}, cv=5, scoring='accuracy').fit(X, y)
+
+        assert search.best_params_ == reference.best_params_
+        assert search.best_score_ == pytest.approx(reference.best_score_)
+        # Same fitted-search attributes as GridSearchCV, apart from the timings
+        assert search.n_splits_ == reference.n_splits_ and search.refit_time_ > 0
+        assert search.scorer_(search.best_estimator_, X, y) == reference.scorer_(reference.best_estimator_, X, y)
+        assert set(search.cv_results_) == set(reference.cv_results_)
+        for key in ["mean_test_score", "std_test_score", "rank_test_score", "param_C"] + [f"split{k}_test_score" for k in range(5)]:
+            np.testing.assert_allclose(np.asarray(search.cv_results_[key], dtype=float), np.asarray(reference.cv_results_[key], dtype=float))
+
+def test_unseeded_estimators_are_not_cached(tmp_path):
+    """Scores of an estimator without a random_state are not reproducible, so they are never cached."""
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.model_selection import GridSearchCV
+    from src.model_trainer import _fit_search
+
+    cache = StageCache(cache_dir=tmp_path, enabled=True)
+    X, y = np.random.default_rng(0).normal(size=(60, 3)), np.arange(60) % 2
+    search = GridSearchCV(RandomForestClassifier(n_estimators=5), {"max_depth": [2, 3]}, cv=3)
+
+    search, _ = _fit_search(search, X, y, cache)
+
+    assert search.best_estimator_ is not None
+    assert not list(tmp_path.rglob("*.joblib"))
+
+def test_artifact_cache_downloads_once_and_evicts(tmp_path, monkeypatch):
+    """Artifacts are fetched once per run; whole entries are evicted least recently used first."""
+    import mlflow
+    from src.cache import ArtifactCache
+
+    downloads = []
+    def fake_download(run_id, artifact_path, dst_path):
+        downloads.append(run_id)
+        target = Path(dst_path) / artifact_path
+        target.mkdir(parents=True)
+        (target / "model.pkl").write_bytes(b"x" * 60 * 1024)
+        return str(target)
+    monkeypatch.setattr(mlflow.artifacts, "download_artifacts", fake_download)
+
+    cache = ArtifactCache(cache_dir=tmp_path, max_mb=0.15, enabled=True)
+    first = cache.download("run1", "model")
+    assert (first / "model.pkl").exists()
+    assert cache.download("run1", "model") == first
+    assert downloads == ["run1"]
+
+    time.sleep(0.01)
+    cache.download("run2", "model")
+    time.sleep(0.01)
+    cache.download("run1", "model")  # touch: "run2" becomes the oldest entry
+    time.sleep(0.01)
+    cache.download("run3", "model")
+
+    assert first.exists()
+    assert not cache._path("run2", "model").exists()
+    assert downloads == ["run1", "run2", "run3"]
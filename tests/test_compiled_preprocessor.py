@@ -0,0 +1,51 @@
+import os
+import joblib
+import numpy as np
+from src.storage import table_path, read_table
+import pytest
+from src.compiled_preprocessor import CompiledPreprocessor
+
+PREPROCESSOR_PATH = "models/preprocessor.pkl"
+PROCESSED_DATA_PATH = table_path("data/processed/heart_cleaned")
+
+@pytest.fixture(scope="module")
+def preprocessor():
+    if not os.path.exists(PREPROCESSOR_PATH):
+        pytest.skip("Preprocessor missing")
+    return joblib.load(PREPROCESSOR_PATH)
+
+def test_compiled_matches_probe(preprocessor):
+    compiled = CompiledPreprocessor.from_sklearn(preprocessor)
+    assert compiled.verify(preprocessor)
+
+def test_compiled_matches_dataset(preprocessor):
+    """The compiled path must reproduce preprocessor.transform bit for bit."""
+    if not os.path.exists(PROCESSED_DATA_PATH):
+        pytest.skip("Processed data missing")
+
+    df = read_table(PROCESSED_DATA_PATH).drop(columns=["target"])
+    expected = preprocessor.transform(df)
+    if hasattr(expected, "toarray"):
+        expected = expected.toarray()
+
+    compiled = CompiledPreprocessor.from_sklearn(preprocessor)
+    actual = compiled.transform_records(df.to_dict(orient="records"))
+    assert np.array_equal(expected, actual)
+
+def test_compiled_imputes_missing_values(preprocessor):
+    """Missing fields are filled with the imputer values before scaling and encoding."""
+    compiled = CompiledPreprocessor.from_sklearn(preprocessor)
+    records = compiled.probe_records()[:3]
+    fill_values = records[0]
+    compiled.set_fill_values(fill_values)
+
+    partial = [{**record, "age": None} for record in records]
+    partial[1].pop("ca")
+    filled = [{**record, "age": fill_values["age"]} for record in records]
+    filled[1]["ca"] = fill_values["ca"]
+
+    assert np.array_equal(compiled.transform_records(partial), compiled.transform_records(filled))
+
+    # The fill values survive the array export
+    restored = CompiledPreprocessor.from_arrays(compiled.to_arrays())
+    assert np.array_equal(restored.fill_values, compiled.fill_values)
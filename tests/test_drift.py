@@ -0,0 +1,62 @@
+import numpy as np
+from app.drift import DriftMonitor
+from src.profiling import DataProfiler
+
+FIELDS = ["age", "chol", "cp", "thal"]
+
+def _monitor(make_frame, window_size=500):
+    profile = DataProfiler(["cp", "thal"]).update(make_frame()).to_dict()
+    return DriftMonitor(profile, FIELDS, window_size=window_size)
+
+def test_no_drift_on_reference_distribution(make_frame):
+    monitor = _monitor(make_frame)
+    monitor.observe(make_frame(seed=1).to_dict("records"))
+    scores = monitor.snapshot()
+
+    assert set(scores) == set(FIELDS)
+    for name, score in scores.items():
+        assert score["psi"] < 0.1, name
+        assert abs(score["mean_shift"]) < 0.2, name
+    assert "ks" in scores["age"] and "ks" not in scores["cp"]
+
+def test_drift_detected_and_window_rolls_over(make_frame):
+    monitor = _monitor(make_frame, window_size=500)
+    shifted = make_frame(seed=2)
+    shifted["age"] += 20
+    shifted["thal"] = 9.0  # category never seen in training
+
+    for start in range(0, 1000, 50):
+        monitor.observe(shifted.iloc[start:start + 50].to_dict("records"))
+    scores = monitor.snapshot()
+    assert scores["age"]["psi"] > 0.5 and scores["age"]["ks"] > 0.3
+    assert scores["thal"]["psi"] > 0.5
+    assert scores["chol"]["psi"] < 0.1
+
+    # Constant memory: only the last window_size requests are counted
+    assert scores["age"]["samples"] <= 500
+
+    # Back to the reference distribution: old slices age out of the window
+    for start in range(0, 1000, 50):
+        monitor.observe(make_frame(seed=3).iloc[start:start + 50].to_dict("records"))
+    assert monitor.snapshot()["age"]["psi"] < 0.1
+
+def test_large_batch_is_split_across_slices(make_frame):
+    """A single batch larger than the window rotates through the slices instead of overfilling one."""
+    monitor = _monitor(make_frame, window_size=500)
+    monitor.observe(make_frame(n=1730, seed=1).to_dict("records"))
+    assert 0 < monitor.snapshot()["age"]["samples"] <= 500
+    assert monitor.n.max() <= monitor.slice_size
+
+def test_missing_values_are_skipped(make_frame):
+    monitor = _monitor(make_frame)
+    monitor.observe([{"age": None, "chol": 240.0, "cp": 2, "thal": None}] * 10)
+    scores = monitor.snapshot()
+    assert "age" not in scores and scores["chol"]["samples"] == 10
+
+def test_monitor_loads_saved_profile_and_state(make_frame, tmp_path):
+    """from_profile reads the describe()-shaped profile together with its .state.json sidecar."""
+    path = tmp_path / "data_profile.json"
+    DataProfiler(["cp", "thal"]).update(make_frame()).save(path)
+
+    monitor = DriftMonitor.from_profile(path, FIELDS)
+    assert monitor.names == FIELDS
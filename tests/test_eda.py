@@ -1,9 +1,11 @@
 import os
+import json
 import pytest
 from src.eda import EDAAutomator
+from src.storage import table_path
 
 def test_eda_report_generation():
-    processed_data = "data/processed/heart_cleaned.csv"
+    processed_data = table_path("data/processed/heart_cleaned")
     if not os.path.exists(processed_data):
         pytest.skip("Processed data missing")
         
@@ -11,4 +13,37 @@ def test_eda_report_generation():
     eda.run_full_report()
     
     assert os.path.exists("reports/class_distribution.png")
-    assert os.path.exists("reports/correlation_heatmap.png")
\ No newline at end of file
+    assert os.path.exists("reports/correlation_heatmap.png")
+
+def test_eda_fast_mode_selected_figures():
+    """Fast mode renders only the requested figures and reports time per figure."""
+    processed_data = table_path("data/processed/heart_cleaned")
+    if not os.path.exists(processed_data):
+        pytest.skip("Processed data missing")
+
+    eda = EDAAutomator(processed_data, fast=True, dpi=50, figures=["numerical_distributions"], sample_size=100)
+    timings = eda.run_full_report()
+
+    assert set(timings) == {"numerical_distributions", "save_stats", "total"}
+    assert os.path.exists("reports/numerical_distributions.png")
+
+    # The profile keeps the column -> stats shape; the mergeable state goes to the sidecar
+    with open("reports/data_profile.json") as f:
+        profile = json.load(f)
+    assert not [col for col in profile if col.startswith("_")]
+    assert set(profile["age"]) >= {"count", "mean", "std", "50%"}
+    with open("reports/data_profile.state.json") as f:
+        assert set(json.load(f)) == {"_frequencies", "_state"}
+
+    # The KDE sample keeps the class balance of the full data
+    sample = eda.stratified_sample()
+    assert len(sample) <= 101
+    assert abs(sample["target"].mean() - eda.data["target"].mean()) < 0.02
+
+def test_eda_rejects_unknown_figure():
+    processed_data = table_path("data/processed/heart_cleaned")
+    if not os.path.exists(processed_data):
+        pytest.skip("Processed data missing")
+
+    with pytest.raises(ValueError):
+        EDAAutomator(processed_data, figures=["pairplot"])
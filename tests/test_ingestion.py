@@ -1,16 +1,51 @@
 import os
 import pytest
 from src.ingestion import DataIngestion
+from src.storage import table_path, read_table
 
 def test_data_ingestion_files():
     ingestor = DataIngestion()
     ingestor.initiate_data_ingestion()
     
     assert os.path.exists("data/raw/heart_raw.csv")
-    assert os.path.exists("data/processed/heart_cleaned.csv")
+    assert os.path.exists(table_path("data/processed/heart_cleaned"))
 
 def test_data_ingestion_columns():
-    import pandas as pd
-    df = pd.read_csv("data/processed/heart_cleaned.csv")
+    df = read_table("data/processed/heart_cleaned")
     assert "target" in df.columns
-    assert df["target"].isin([0, 1]).all()
\ No newline at end of file
+    assert df["target"].isin([0, 1]).all()
+
+def test_streaming_ingestion_matches_in_memory(tmp_path):
+    """Chunked ingestion of a local file gives the same cleaned data as the in-memory path."""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(0)
+    rows = []
+    for i in range(101):
+        values = [float(v) for v in rng.integers(0, 5, 13)] + [int(rng.integers(0, 5))]
+        # Integer text in sex (never missing) and thal (missing in all but the last chunk)
+        values[1], values[12] = int(values[1]), int(values[12])
+        if i % 7 == 0:
+            values[11] = "?"
+        if i % 11 == 0:
+            values[12] = "?"
+        rows.append(",".join(str(v) for v in values))
+    source = tmp_path / "source.data"
+    source.write_text("\n".join(rows) + "\n")
+
+    results = {}
+    for chunksize in (0, 10):
+        ingestor = DataIngestion(source=str(source), chunksize=chunksize)
+        ingestor.raw_data_path = tmp_path / f"raw_{chunksize}.csv"
+        ingestor.processed_data_path = tmp_path / f"cleaned_{chunksize}.parquet"
+        ingestor.imputer_path = tmp_path / f"imputer_{chunksize}.json"
+        results[chunksize] = read_table(ingestor.initiate_data_ingestion())
+
+    assert (tmp_path / "imputer_0.json").read_text() == (tmp_path / "imputer_10.json").read_text()
+
+    # Same schema too: integer columns stay integers in both modes
+    pd.testing.assert_frame_equal(results[0], results[10])
+    assert results[10]["sex"].dtype == results[10]["target"].dtype == np.int64
+    assert not results[10].isnull().any().any()
+    assert results[10]["target"].isin([0, 1]).all()
@@ -0,0 +1,23 @@
+from prometheus_client import REGISTRY
+from app import instrumentation
+from app.instrumentation import StageTimer, drop_previous_versions
+
+class StubBundle:
+    def __init__(self, version):
+        self.name, self.version = "stub_model", version
+
+def _count(version):
+    labels = {"stage": "preprocess", "model": "stub_model", "version": version}
+    return REGISTRY.get_sample_value("predict_stage_duration_seconds_count", labels)
+
+def test_swaps_drop_previous_version_series():
+    """Only the active version keeps its stage series, however many reloads happen."""
+    for i in range(5):
+        bundle = StubBundle(f"v{i}")
+        drop_previous_versions(bundle)
+        with StageTimer(bundle).stage("preprocess"):
+            pass
+
+    assert _count("v4") == 1
+    assert all(_count(f"v{i}") is None for i in range(4))
+    assert {key[2] for key in instrumentation._children if key[1] == "stub_model"} == {"v4"}
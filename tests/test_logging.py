@@ -0,0 +1,43 @@
+import logging
+from src.async_logging import DroppingQueueHandler, RequestLogSampler, enable_queue_logging
+from src.logger import JSONFormatter, notebook_origin
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(self.format(record))
+
+def test_queue_logging_writes_in_background():
+    log = logging.getLogger("test_queue_logging")
+    log.propagate = False
+    sink = ListHandler()
+    log.addHandler(sink)
+
+    listener = enable_queue_logging(log)
+    assert isinstance(log.handlers[0], DroppingQueueHandler)
+    log.warning("patient %s scored", {"age": 63})
+    listener.stop()
+
+    assert sink.messages == ["patient {'age': 63} scored"]
+
+def test_full_queue_drops_instead_of_blocking():
+    import queue
+    handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+    record = logging.makeLogRecord({"msg": "x"})
+    handler.handle(record)
+    handler.handle(record)
+    assert handler.dropped == 1
+
+def test_request_log_sampler():
+    assert all(RequestLogSampler(1.0)() for _ in range(100))
+    assert not any(RequestLogSampler(0.0)() for _ in range(100))
+    assert 100 < sum(RequestLogSampler(0.25)() for _ in range(1000)) < 400
+
+def test_notebook_origin_resolved_once():
+    notebook_origin.cache_clear()
+    JSONFormatter().format(logging.makeLogRecord({"msg": "a"}))
+    JSONFormatter().format(logging.makeLogRecord({"msg": "b"}))
+    assert notebook_origin.cache_info().misses == 1
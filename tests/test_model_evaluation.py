@@ -83,4 +83,46 @@ def test_mlflow_experiment_exists():
 #     evaluator.evaluate_and_register()
 
 #     assert dest_path.exists()
-#     assert dest_path.stat().st_size > 0  # Check if file is not empty
\ No newline at end of file
+#     assert dest_path.stat().st_size > 0  # Check if file is not empty
+
+def _log_training_run(client, experiment_id, recall, batch, tmp_path):
+    run = client.create_run(experiment_id, tags={"training_batch": batch})
+    model_pkl = tmp_path / "model.pkl"
+    model_pkl.write_bytes(f"model-{run.info.run_id}".encode())
+    client.log_artifact(run.info.run_id, str(model_pkl), "model")
+    client.log_metric(run.info.run_id, "recall", recall)
+    client.set_terminated(run.info.run_id)
+    return run.info.run_id
+
+def test_evaluation_is_idempotent_and_scoped_to_latest_batch(isolated_tracking, tmp_path, monkeypatch):
+    """Re-evaluating the same winner neither downloads nor registers again; a new batch is compared on its own."""
+    from src.cache import ArtifactCache
+
+    client = isolated_tracking
+    downloads = []
+    download_artifacts = mlflow.artifacts.download_artifacts
+    monkeypatch.setattr(mlflow.artifacts, "download_artifacts", lambda **kw: downloads.append(kw) or download_artifacts(**kw))
+
+    evaluator = ModelEvaluator(artifact_cache=ArtifactCache(cache_dir=tmp_path / "cache", enabled=True))
+    evaluator.destination_path = tmp_path / "best_model.pkl"
+    experiment_id = client.create_experiment(evaluator.experiment_name)
+
+    _log_training_run(client, experiment_id, 0.8, "a", tmp_path)
+    winner = _log_training_run(client, experiment_id, 0.9, "a", tmp_path)
+    first = evaluator.evaluate_and_register()
+    assert first.run_id == winner and first.current_stage == "Staging"
+    assert evaluator.destination_path.read_bytes() == f"model-{winner}".encode()
+    assert len(downloads) == 1
+
+    # Same winner: no download, no new version
+    assert evaluator.evaluate_and_register().version == first.version
+    evaluator.destination_path.unlink()
+    assert evaluator.evaluate_and_register().version == first.version
+    assert evaluator.destination_path.exists()
+    assert len(downloads) == 1
+
+    # A newer batch wins even with a lower recall than older runs
+    newer = _log_training_run(client, experiment_id, 0.5, "b", tmp_path)
+    second = evaluator.evaluate_and_register()
+    assert second.run_id == newer and second.version != first.version
+    assert len(client.search_model_versions(f"name='{evaluator.registered_model_name}'")) == 2
@@ -0,0 +1,77 @@
+import os
+import joblib
+import numpy as np
+from src.storage import table_path, read_table
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.ensemble import RandomForestClassifier
+from src.array_model import ArrayModel
+from src.model_export import ModelExporter
+
+PROCESSED_DATA_PATH = table_path("data/processed/heart_cleaned")
+PREPROCESSOR_PATH = "models/preprocessor.pkl"
+
+@pytest.fixture(scope="module")
+def dataset():
+    if not (os.path.exists(PROCESSED_DATA_PATH) and os.path.exists(PREPROCESSOR_PATH)):
+        pytest.skip("Processed data or preprocessor missing")
+    df = read_table(PROCESSED_DATA_PATH)
+    preprocessor = joblib.load(PREPROCESSOR_PATH)
+    return df.drop(columns=["target"]), df["target"], preprocessor
+
+@pytest.mark.parametrize("model", [
+    LogisticRegression(max_iter=1000),
+    RandomForestClassifier(n_estimators=25, random_state=42),
+])
+def test_array_model_parity(model, dataset):
+    """The NumPy-only predictor must reproduce the sklearn pipeline."""
+    X_raw, y, preprocessor = dataset
+    X = preprocessor.transform(X_raw)
+    model.fit(X, y)
+
+    array_model = ArrayModel(**_as_loaded(model))
+    np.testing.assert_allclose(array_model.predict_proba(X), model.predict_proba(X), rtol=0, atol=1e-12)
+    assert (array_model.predict(X) == model.predict(X)).all()
+
+def _exporter(tmp_path):
+    """Exports to tmp_path instead of the models/ artifacts the API serves."""
+    exporter = ModelExporter()
+    exporter.export_path = tmp_path / "best_model.npz"
+    exporter.mmap_dir = tmp_path / "best_model_mmap"
+    return exporter
+
+def test_exported_file_parity(dataset, tmp_path):
+    """Round-trip the exported .npz, including preprocessing from raw records."""
+    if not os.path.exists("models/best_model.pkl"):
+        pytest.skip("Best model missing")
+    X_raw, _, preprocessor = dataset
+    model = joblib.load("models/best_model.pkl")
+
+    export_path = _exporter(tmp_path).export()
+    array_model = ArrayModel.load(export_path)
+
+    X_arr = array_model.preprocessor.transform_records(X_raw.to_dict(orient="records"))
+    np.testing.assert_allclose(
+        array_model.predict_proba(X_arr),
+        model.predict_proba(preprocessor.transform(X_raw)),
+        rtol=0, atol=1e-12
+    )
+
+def _as_loaded(model):
+    arrays = ArrayModel.model_to_arrays(model)
+    return {"kind": str(arrays["model_kind"]), "classes": arrays["classes"], "arrays": arrays}
+
+def test_memory_mapped_export(dataset, tmp_path):
+    """The memory-mapped layout loads lazily and predicts like the .npz export."""
+    if not os.path.exists("models/best_model.pkl"):
+        pytest.skip("Best model missing")
+    X_raw, _, preprocessor = dataset
+
+    exporter = _exporter(tmp_path)
+    exporter.export()
+    npz_model = ArrayModel.load(exporter.export_path)
+    mmap_model = ArrayModel.load(exporter.mmap_dir, mmap_mode="r")
+
+    X = preprocessor.transform(X_raw)
+    assert isinstance(mmap_model.arrays["classes"], np.memmap)
+    assert np.array_equal(mmap_model.predict_proba(X), npz_model.predict_proba(X))
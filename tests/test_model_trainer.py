@@ -26,4 +26,92 @@ def test_eval_metrics_logic():
     acc, prec, rec, roc = trainer.eval_metrics(actual, pred, pred_proba)
     
     assert 0 <= acc <= 1
-    assert rec == 0.5  # 1 out of 2 positives caught
\ No newline at end of file
+    assert rec == 0.5  # 1 out of 2 positives caught
+
+def test_parallel_search_matches_families():
+    """Parallel mode fits every family and returns a fitted search for each."""
+    from src.storage import read_table
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.ensemble import RandomForestClassifier
+
+    trainer = ModelTrainer(n_jobs=2, parallel_families=True)
+    if not trainer.data_path.exists():
+        pytest.skip("Transformed data missing")
+
+    df = read_table(trainer.data_path)
+    X, y = df.drop(columns=['target']), df['target']
+    models = {
+        "Logistic_Regression": {"model": LogisticRegression(max_iter=1000), "params": {"C": [0.1, 1.0]}},
+        "Random_Forest": {"model": RandomForestClassifier(), "params": {"n_estimators": [10, 20]}},
+    }
+
+    fitted = trainer.fit_searches(models, X, y)
+
+    assert set(fitted) == set(models)
+    for name, (search, seconds) in fitted.items():
+        assert search.best_params_ in [{k: v} for k, values in models[name]["params"].items() for v in values]
+        assert seconds > 0
+
+@pytest.mark.parametrize("strategy", ["random", "halving"])
+def test_search_strategies(strategy):
+    """Randomized and successive-halving searches fit and report their budget."""
+    from src.storage import read_table
+    from sklearn.ensemble import RandomForestClassifier
+
+    trainer = ModelTrainer(search_strategy=strategy)
+    if not trainer.data_path.exists():
+        pytest.skip("Transformed data missing")
+    trainer.search_n_iter = 3
+
+    df = read_table(trainer.data_path)
+    X, y = df.drop(columns=['target']), df['target']
+    models = {
+        "Random_Forest": {
+            "model": RandomForestClassifier(),
+            "params": {"n_estimators": [10, 20], "max_depth": [None, 5]},
+            "distributions": {"n_estimators": [10, 20, 30], "max_depth": [None, 5]},
+            "halving_resource": "n_estimators",
+            "max_resources": 20
+        }
+    }
+
+    search, _ = trainer.fit_searches(models, X, y)["Random_Forest"]
+    budget = trainer.describe_search_budget(search)
+
+    if strategy == "random":
+        assert len(search.cv_results_["params"]) == 3
+        assert budget == "n_iter=3"
+    else:
+        assert "n_estimators" not in search.param_grid
+        assert budget.startswith("resource=n_estimators")
+
+def test_unknown_search_strategy():
+    with pytest.raises(ValueError):
+        ModelTrainer(search_strategy="bayesian")
+
+def test_cached_search_logs_per_fold_cv_results(isolated_tracking, tmp_path, monkeypatch):
+    """With the stage cache on, every candidate's fold, mean, std and rank scores reach MLflow."""
+    from sklearn.linear_model import LogisticRegression
+    from src.cache import StageCache
+
+    trainer = ModelTrainer(log_plots=False)
+    if not trainer.data_path.exists():
+        pytest.skip("Transformed data missing")
+    trainer.cache = StageCache(cache_dir=tmp_path / "cache", enabled=True)
+    trainer.model_dir = tmp_path
+    monkeypatch.setattr(trainer, "get_model_configs", lambda: {
+        "Logistic_Regression": {"model": LogisticRegression(max_iter=1000, random_state=42), "params": {"C": [0.1, 1.0]}}
+    })
+
+    # Second pass is served entirely from the cache
+    for _ in range(2):
+        trainer.initiate_model_trainer()
+
+    client = isolated_tracking
+    runs = client.search_runs([client.get_experiment_by_name("Heart_Disease_Classification").experiment_id])
+    assert len(runs) == 2
+    for run in runs:
+        for key in ["cv_mean_test_score", "cv_std_test_score"] + [f"cv_split{k}_test_score" for k in range(5)]:
+            assert sorted(m.step for m in client.get_metric_history(run.info.run_id, key)) == [0, 1], key
+        assert "cv_rank_test_score" not in run.data.metrics
+        assert [f.path for f in client.list_artifacts(run.info.run_id)] == ["model"]
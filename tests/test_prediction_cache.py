@@ -0,0 +1,28 @@
+import time
+from app.prediction_cache import PredictionCache
+
+FIELDS = ["age", "oldpeak"]
+
+def test_key_is_canonical_and_versioned():
+    cache = PredictionCache(FIELDS)
+    assert cache.key("v1", {"age": 63, "oldpeak": 2}) == cache.key("v1", {"oldpeak": 2.0, "age": 63.0})
+    assert cache.key("v1", {"age": 63}) == cache.key("v1", {"age": 63, "oldpeak": None})
+    assert cache.key("v1", {"age": 63, "oldpeak": 2}) != cache.key("v2", {"age": 63, "oldpeak": 2})
+
+def test_lru_eviction_keeps_recently_used():
+    cache = PredictionCache(FIELDS, capacity=2)
+    cache.set_many([("a", 0.1), ("b", 0.2)])
+    assert cache.get_many(["a"]) == [0.1]  # "b" is now the least recently used
+    cache.set_many([("c", 0.3)])
+    assert cache.get_many(["a", "b", "c"]) == [0.1, None, 0.3]
+
+def test_entries_expire_and_clear():
+    cache = PredictionCache(FIELDS, ttl_s=0.05)
+    cache.set_many([("a", 0.1)])
+    assert cache.get_many(["a"]) == [0.1]
+    time.sleep(0.1)
+    assert cache.get_many(["a"]) == [None]
+
+    cache.set_many([("b", 0.2)])
+    cache.clear()
+    assert cache.get_many(["b"]) == [None]
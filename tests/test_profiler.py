@@ -0,0 +1,32 @@
+import threading
+import time
+from app.profiler import SamplingProfiler
+
+def _busy_loop(seconds):
+    end = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < end:
+        total += sum(range(100))
+    return total
+
+def test_profiles_calling_thread_in_folded_format(tmp_path):
+    with SamplingProfiler(threading.get_ident(), interval_s=0.001) as profiler:
+        _busy_loop(0.2)
+
+    assert profiler.samples
+    lines = profiler.folded().splitlines()
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert any("_busy_loop (test_profiler.py:" in line for line in lines)
+
+    path = profiler.save(tmp_path / "profile.folded")
+    assert path.read_text().splitlines() == lines
+
+def test_all_threads_are_rooted_at_thread_name():
+    worker = threading.Thread(target=_busy_loop, args=(0.2,), name="busy-worker")
+    with SamplingProfiler(interval_s=0.001) as profiler:
+        worker.start()
+        worker.join()
+
+    assert any(stack.startswith("busy-worker;") for stack in profiler.samples)
+    assert not any(stack.startswith("sampling-profiler") for stack in profiler.samples)
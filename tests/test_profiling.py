@@ -0,0 +1,50 @@
+import json
+import numpy as np
+from src.profiling import DataProfiler
+
+CATEGORICAL = ["cp", "thal"]
+
+def test_profile_matches_describe(make_frame):
+    df = make_frame(5000)
+    profiler = DataProfiler(CATEGORICAL).update(df)
+    profile = profiler.describe()
+    expected = df.describe()
+
+    for col in df.columns:
+        stats = profile[col]
+        assert stats["count"] == expected.loc["count", col]
+        assert np.isclose(stats["mean"], expected.loc["mean", col])
+        assert np.isclose(stats["std"], expected.loc["std", col])
+        assert stats["min"] == expected.loc["min", col] and stats["max"] == expected.loc["max", col]
+        for name, q in (("25%", 0.25), ("50%", 0.5), ("75%", 0.75)):
+            true_value = np.quantile(df[col], q, method="lower")
+            assert abs(stats[name] - true_value) <= profiler.alpha * abs(true_value) + 1e-12
+
+    assert profiler.frequencies["cp"] == {format(float(k), "g"): v for k, v in df["cp"].value_counts().items()}
+
+def test_profile_merge_equals_single_pass(make_frame):
+    """Per-chunk profiles merged together give the same result as one pass."""
+    df = make_frame(5000)
+    single = DataProfiler(CATEGORICAL).update(df).to_dict()
+
+    merged = DataProfiler(CATEGORICAL)
+    for start in range(0, len(df), 700):
+        merged.merge(DataProfiler(CATEGORICAL).update(df.iloc[start:start + 700]))
+    merged = merged.to_dict()
+
+    assert merged["_frequencies"] == single["_frequencies"]
+    for col in df.columns:
+        assert merged["_state"][col]["sketch"] == single["_state"][col]["sketch"]
+        for key, value in single[col].items():
+            assert np.isclose(merged[col][key], value)
+
+def test_profile_json_round_trip(make_frame):
+    df = make_frame(5000)
+    first = DataProfiler(CATEGORICAL).update(df.iloc[:2000])
+    restored = DataProfiler.from_dict(json.loads(json.dumps(first.to_dict())))
+
+    # A restored profile keeps merging new data
+    restored.update(df.iloc[2000:])
+    expected = DataProfiler(CATEGORICAL).update(df).to_dict()
+    assert restored.to_dict()["_frequencies"] == expected["_frequencies"]
+    assert np.isclose(restored.describe()["age"]["std"], expected["age"]["std"])
@@ -0,0 +1,20 @@
+import numpy as np
+from app.registry import ModelBundle, ModelRegistry
+
+class StubModel:
+    classes_ = np.array([0, 1])
+
+def test_registry_swaps_on_artifact_change(tmp_path):
+    """A changed artifact produces a new version; unchanged artifacts are not reloaded."""
+    artifact = tmp_path / "model.bin"
+    artifact.write_bytes(b"v1")
+    registry = ModelRegistry(lambda: ModelBundle(StubModel()), [artifact])
+
+    first, swapped = registry.reload()
+    assert swapped and first.version
+    assert registry.reload() == (first, False)
+
+    artifact.write_bytes(b"v2")
+    second, swapped = registry.reload()
+    assert swapped and second.version != first.version
+    assert registry.current() is second
@@ -0,0 +1,54 @@
+import pandas as pd
+import pytest
+from src.storage import table_path, read_table, write_table, iter_table
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather", "csv"])
+def test_table_round_trip(tmp_path, fmt):
+    """Columnar formats preserve dtypes and column names."""
+    df = pd.DataFrame({
+        "num_pipeline__age": [0.5, -1.25],
+        "cat_pipeline__sex_1.0": [1.0, 0.0],
+        "target": pd.Series([1, 0], dtype="int64"),
+    })
+    path = write_table(df, tmp_path / "table", fmt=fmt, export_csv=False)
+    assert path == table_path(tmp_path / "table", fmt)
+
+    loaded = read_table(path) if fmt != "csv" else pd.read_csv(path)
+    pd.testing.assert_frame_equal(loaded, df)
+
+def test_csv_export_is_optional(tmp_path):
+    df = pd.DataFrame({"a": [1, 2]})
+    write_table(df, tmp_path / "table", fmt="parquet", export_csv=False)
+    assert not (tmp_path / "table.csv").exists()
+
+    write_table(df, tmp_path / "table", fmt="parquet", export_csv=True)
+    assert (tmp_path / "table.csv").exists()
+
+def test_read_table_falls_back_to_csv(tmp_path):
+    pd.DataFrame({"a": [1, 2]}).to_csv(tmp_path / "legacy.csv", index=False)
+    assert read_table(tmp_path / "legacy")["a"].tolist() == [1, 2]
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather", "csv"])
+def test_iter_table_chunks(tmp_path, fmt):
+    df = pd.DataFrame({"a": [1.0, 2.0, 3.0], "b": [4, 5, 6]})
+    path = write_table(df, tmp_path / "table", fmt=fmt, export_csv=False)
+
+    chunks = list(iter_table(path, chunksize=2))
+    assert [len(c) for c in chunks] == [2, 1]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), df)
+
+def test_sparse_round_trip(tmp_path):
+    import numpy as np
+    import scipy.sparse as sp
+    from src.storage import write_sparse, read_sparse, sparse_path
+
+    matrix = sp.random(50, 200, density=0.02, format="csr", random_state=0)
+    target = np.arange(50) % 2
+    path = write_sparse(matrix, target, [f"f{i}" for i in range(200)], tmp_path / "features")
+    assert path == sparse_path(tmp_path / "features")
+
+    loaded, loaded_target, names = read_sparse(path)
+    assert loaded.format == "csr"
+    assert (loaded != matrix).nnz == 0
+    assert loaded_target.tolist() == target.tolist()
+    assert names[:2] == ["f0", "f1"] and len(names) == 200
@@ -0,0 +1,78 @@
+import pytest
+import mlflow
+import mlflow.sklearn
+from mlflow.tracking import MlflowClient
+
+from src.tracking import BatchedRunLogger
+
+class CountingClient(MlflowClient):
+    def __init__(self):
+        super().__init__()
+        self.batches = 0
+
+    def log_batch(self, *args, **kwargs):
+        self.batches += 1
+        return super().log_batch(*args, **kwargs)
+
+def test_buffered_logging_uses_few_batches(isolated_tracking):
+    """Params, metrics and CV results are written at flush, chunked by the store limits."""
+    client = CountingClient()
+    run_id = client.create_run("0").info.run_id
+    cv_results = {
+        "params": [{"C": c} for c in range(150)],
+        "mean_test_score": [0.5] * 150,
+        "split0_test_score": [0.4] * 150,
+        "rank_test_score": list(range(150)),
+    }
+
+    with BatchedRunLogger(async_artifacts=False, client=client) as tracker:
+        tracker.log_params(run_id, {"search_strategy": "grid"})
+        tracker.log_metrics(run_id, {"accuracy": 0.9, "recall": 0.8})
+        tracker.log_cv_results(run_id, cv_results)
+        assert client.batches == 0
+
+    data = client.get_run(run_id).data
+    assert data.params["search_strategy"] == "grid"
+    assert data.params["cv_candidate_149"] == '{"C": 149}'
+    assert data.metrics["accuracy"] == 0.9
+    assert "cv_rank_test_score" not in data.metrics
+    # 151 params need two batches (100 params/tags per call)
+    assert client.batches == 2
+
+    history = client.get_metric_history(run_id, "cv_mean_test_score")
+    assert sorted(m.step for m in history) == list(range(150))
+
+def test_async_artifacts_upload_by_run_id(isolated_tracking, tmp_path):
+    """Artifacts and models are uploaded on the worker thread while the main thread has another run active."""
+    from sklearn.linear_model import LogisticRegression
+
+    artifact = tmp_path / "note.txt"
+    artifact.write_text("ok")
+    model = LogisticRegression().fit([[0.0], [1.0]], [0, 1])
+
+    client = isolated_tracking
+    tracker = BatchedRunLogger(async_artifacts=True)
+    run_ids = [client.create_run("0").info.run_id for _ in range(2)]
+    with mlflow.start_run() as active:
+        for run_id in run_ids:
+            tracker.log_artifact(run_id, artifact)
+            tracker.log_model(run_id, model)
+        tracker.flush()
+        assert mlflow.active_run().info.run_id == active.info.run_id
+    tracker.close()
+
+    for run_id in run_ids:
+        assert sorted(f.path for f in client.list_artifacts(run_id)) == ["model", "note.txt"]
+        loaded = mlflow.sklearn.load_model(f"runs:/{run_id}/model")
+        assert loaded.predict([[1.0]]).tolist() == [1]
+
+def test_artifact_errors_propagate():
+    """A failed background job is raised from flush."""
+    def fail():
+        raise RuntimeError("upload failed")
+
+    tracker = BatchedRunLogger(async_artifacts=True)
+    tracker.submit(fail)
+
+    with pytest.raises(RuntimeError, match="upload failed"):
+        tracker.close()
@@ -1,14 +1,53 @@
+import pytest
 import os
 import joblib
 from src.transformation import DataTransformation
+from src.storage import table_path, read_table
 
 def test_transformation_output():
     transformer = DataTransformation()
     transformer.initiate_data_transformation()
     
-    assert os.path.exists("data/processed/heart_transformed.csv")
+    assert os.path.exists(table_path("data/processed/heart_transformed"))
     assert os.path.exists("models/preprocessor.pkl")
 
 def test_preprocessor_loading():
     preprocessor = joblib.load("models/preprocessor.pkl")
-    assert hasattr(preprocessor, "transform")  # Check if it's a valid sklearn object
\ No newline at end of file
+    assert hasattr(preprocessor, "transform")  # Check if it's a valid sklearn object
+
+def test_sparse_transformation_feeds_trainer(tmp_path):
+    """Sparse mode writes a CSR artifact that ModelTrainer trains on without densifying."""
+    import scipy.sparse as sp
+    from sklearn.linear_model import LogisticRegression
+    from src.model_trainer import ModelTrainer
+    from src.storage import read_sparse
+    from src.cache import StageCache
+
+    # Keep the test's cache entries out of the repo's .cache/pipeline
+    cache = StageCache(cache_dir=tmp_path / "cache", enabled=True)
+    transformer = DataTransformation(sparse=True)
+    if not os.path.exists(transformer.processed_data_path):
+        pytest.skip("Processed data missing")
+    transformer.cache = cache
+    transformer.transformed_data_path = tmp_path / "heart_transformed.npz"
+    transformer.preprocessor_obj_file_path = tmp_path / "preprocessor.pkl"
+    transformer.initiate_data_transformation()
+
+    X, y, feature_names = read_sparse(transformer.transformed_data_path)
+    preprocessor = joblib.load(transformer.preprocessor_obj_file_path)
+    assert sp.issparse(X)
+    assert feature_names == list(preprocessor.get_feature_names_out())
+
+    # Same values as the dense table
+    dense = read_table(table_path("data/processed/heart_transformed"))
+    assert abs(X.toarray() - dense.drop(columns=["target"]).to_numpy()).max() < 1e-12
+    assert y.tolist() == dense["target"].tolist()
+
+    trainer = ModelTrainer(sparse=True)
+    trainer.cache = cache
+    trainer.data_path = transformer.transformed_data_path
+    X_train, y_train = trainer.load_training_data()
+    assert sp.issparse(X_train)
+    models = {"Logistic_Regression": {"model": LogisticRegression(max_iter=1000), "params": {"C": [1.0]}}}
+    search, _ = trainer.fit_searches(models, X_train, y_train)["Logistic_Regression"]
+    assert search.best_estimator_.predict(X_train[:5]).shape == (5,)